@@ -0,0 +1,152 @@
+import binascii
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+BASE64_CHARS = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+BASE64_TOKEN_CHARS = BASE64_CHARS + b'-_'
+URLSAFE_TO_STANDARD = bytes.maketrans(b'-_', b'+/')
+CACHE_MAX_ENTRIES = 16384
+CACHE_MAX_BYTES = 16 * 2**20
+MISSING = object()
+
+class DecodeCache:
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self.lock = threading.Lock()
+        self.entries: 'OrderedDict[str, Optional[bytes]]' = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def entry_size(token: str, decoded: Optional[bytes]) -> int:
+        return len(token) + (len(decoded) if decoded else 0)
+
+    def lookup(self, token: str):
+        decoded = self.entries.get(token, MISSING)
+        if decoded is MISSING:
+            self.misses += 1
+        else:
+            self.entries.move_to_end(token)
+            self.hits += 1
+        return decoded
+
+    def store(self, token: str, decoded: Optional[bytes]):
+        size = self.entry_size(token, decoded)
+        if size > self.max_bytes or not self.max_entries:
+            return
+        if token in self.entries:
+            self.size -= self.entry_size(token, self.entries.pop(token))
+        self.entries[token] = decoded
+        self.size += size
+        while self.size > self.max_bytes or len(self.entries) > self.max_entries:
+            evicted_token, evicted = self.entries.popitem(last=False)
+            self.size -= self.entry_size(evicted_token, evicted)
+            self.evictions += 1
+
+    def get(self, token: str):
+        with self.lock:
+            return self.lookup(token)
+
+    def put(self, token: str, decoded: Optional[bytes]):
+        with self.lock:
+            self.store(token, decoded)
+
+    def get_many(self, tokens: Iterable[str]) -> Dict[str, Optional[bytes]]:
+        found: Dict[str, Optional[bytes]] = {}
+        with self.lock:
+            for token in tokens:
+                decoded = self.lookup(token)
+                if decoded is not MISSING:
+                    found[token] = decoded
+        return found
+
+    def put_many(self, decoded_tokens: Dict[str, Optional[bytes]]):
+        with self.lock:
+            for token, decoded in decoded_tokens.items():
+                self.store(token, decoded)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.size
+            }
+
+cache = DecodeCache(CACHE_MAX_ENTRIES, CACHE_MAX_BYTES)
+
+def is_base64(s: str) -> bool:
+    body = s.rstrip('=')
+    return body.isascii() and not body.encode('ascii').translate(None, BASE64_TOKEN_CHARS)
+
+def is_base64_token(s: str) -> bool:
+    if not s or len(s) < 4:
+        return False
+    body = s.rstrip('=')
+    return bool(body) and len(body) % 4 != 1 and is_base64(body)
+
+def decode_uncached(s: str) -> Optional[bytes]:
+    if not s.isascii():
+        return None
+    data = s.encode('ascii').translate(URLSAFE_TO_STANDARD)
+    try:
+        return binascii.a2b_base64(data + b'=' * (-len(data) % 4))
+    except binascii.Error:
+        return None
+
+def decode(s: str) -> Optional[bytes]:
+    decoded = cache.get(s)
+    if decoded is MISSING:
+        decoded = decode_uncached(s)
+        cache.put(s, decoded)
+    return decoded
+
+def to_text(decoded: Optional[bytes]) -> Optional[str]:
+    if not decoded:
+        return None
+    try:
+        return decoded.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+
+def decode_text(s: str) -> Optional[str]:
+    if not is_base64(s):
+        return None
+    return to_text(decode(s))
+
+def safe_decode(s: str) -> Optional[str]:
+    if not s:
+        return None
+    if is_base64(s):
+        text = to_text(decode(s))
+        if text:
+            return text
+    try:
+        decoded = binascii.a2b_base64(s.encode('ascii').translate(URLSAFE_TO_STANDARD))
+    except (binascii.Error, UnicodeEncodeError):
+        return None
+    return decoded.decode('utf-8', errors='ignore')
+
+def decode_many(tokens: Iterable[str]) -> List[Optional[str]]:
+    tokens = list(tokens)
+    candidates = [token for token in dict.fromkeys(tokens) if is_base64_token(token)]
+    decoded = cache.get_many(candidates)
+    missing = {token: decode_uncached(token) for token in candidates if token not in decoded}
+    cache.put_many(missing)
+    decoded.update(missing)
+    texts = {token: to_text(value) for token, value in decoded.items()}
+    return [texts.get(token) for token in tokens]
@@ -0,0 +1,597 @@
+import os
+import sys
+import time
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def best_time(func: Callable, *args, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+def report(name: str, baseline: float, candidate: float):
+    speedup = baseline / candidate if candidate > 0 else float('inf')
+    logger.info(f"{name}: baseline {baseline * 1000:.2f}ms, new {candidate * 1000:.2f}ms ({speedup:.1f}x)")
+
+def read_files(paths: List[str]) -> List[str]:
+    contents = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            contents.append(f.read())
+    return contents
+
+def bench_telegram(paths: List[str]):
+    from bs4 import BeautifulSoup
+    from telegram_parser import extract_telegram_messages
+
+    def bs4_date(message) -> Optional[datetime]:
+        try:
+            time_element = message.find_parent('div', class_='tgme_widget_message').find('time')
+            if time_element and 'datetime' in time_element.attrs:
+                return datetime.fromisoformat(time_element['datetime'].replace('Z', '+00:00'))
+        except Exception:
+            pass
+        return None
+
+    def bs4_extract(html: str) -> List:
+        soup = BeautifulSoup(html, 'html.parser')
+        messages = soup.find_all('div', class_='tgme_widget_message_text')
+        return [(bs4_date(message), message.text) for message in messages]
+
+    for path, html in zip(paths, read_files(paths)):
+        baseline_texts = [text for _, text in bs4_extract(html)]
+        new_texts = [text for _, _, text in extract_telegram_messages(html)]
+        if baseline_texts != new_texts:
+            logger.warning(f"{path}: message texts differ from BeautifulSoup output")
+        report(f"{path} ({len(new_texts)} messages)", best_time(bs4_extract, html), best_time(extract_telegram_messages, html))
+
+def legacy_split_text_by_protocol(text: str) -> List[str]:
+    from config_validator import ConfigValidator
+
+    configs = []
+    protocols = ['vmess://', 'vless://', 'ss://', 'trojan://', 'hysteria2://', 'hy2://', 'wireguard://', 'tuic://', 'ssconf://']
+    current_pos = 0
+    text_length = len(text)
+
+    while current_pos < text_length:
+        next_config_start = text_length
+        matching_protocol = None
+
+        for protocol in protocols:
+            protocol_pos = text.find(protocol, current_pos)
+            if protocol_pos != -1 and protocol_pos < next_config_start:
+                next_config_start = protocol_pos
+                matching_protocol = protocol
+
+        if not matching_protocol:
+            break
+
+        next_protocol_pos = text_length
+        for protocol in protocols:
+            pos = text.find(protocol, next_config_start + len(matching_protocol))
+            if pos != -1 and pos < next_protocol_pos:
+                next_protocol_pos = pos
+
+        current_config = text[next_config_start:next_protocol_pos].strip()
+        if matching_protocol == "vmess://":
+            current_config = ConfigValidator.clean_vmess_config(current_config)
+        elif matching_protocol == "hy2://":
+            current_config = ConfigValidator.normalize_hysteria2_protocol(current_config)
+
+        if ConfigValidator.is_valid_config(current_config):
+            configs.append(current_config)
+
+        current_pos = next_protocol_pos
+    return configs
+
+def bench_split(paths: List[str]):
+    from config_validator import ConfigValidator
+
+    for path, text in zip(paths, read_files(paths)):
+        single_line = text.replace('\n', ' ')
+        baseline = legacy_split_text_by_protocol(single_line)
+        candidate = ConfigValidator._split_text_by_protocol(single_line)
+        if baseline != candidate:
+            logger.warning(f"{path}: scanner output differs from the previous implementation")
+        report(f"{path} ({len(candidate)} configs)",
+               best_time(legacy_split_text_by_protocol, single_line),
+               best_time(ConfigValidator._split_text_by_protocol, single_line))
+
+def bench_dedupe(paths: List[str]):
+    import tracemalloc
+    from digest_set import DigestSet
+
+    base_configs = [line.strip() for text in read_files(paths) for line in text.split('\n') if '://' in line]
+    if not base_configs:
+        logger.warning("No configs found in the given files")
+        return
+
+    def measure(name: str, factory: Callable, count: int):
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        seen = factory()
+        for i in range(count):
+            seen.add(f"{base_configs[i % len(base_configs)]}#{i}")
+        if isinstance(seen, DigestSet):
+            seen.flush()
+        elapsed = time.perf_counter() - start_time
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        spilled = os.fstat(seen.spill_file.fileno()).st_size if getattr(seen, 'spill_file', None) else 0
+        if len(seen) != count:
+            logger.warning(f"{name}: expected {count} entries, got {len(seen)}")
+        logger.info(f"{count} configs, {name}: {current / 2**20:.1f}MB held, {peak / 2**20:.1f}MB peak, "
+                    f"{spilled / 2**20:.1f}MB on disk, {elapsed:.2f}s")
+
+    for count in (10_000, 100_000, 1_000_000):
+        measure('set of strings', set, count)
+        measure('digest set', DigestSet, count)
+        measure('digest set (spilled)', lambda: DigestSet(spill_to_disk=True), count)
+
+def bench_egress(paths: List[str]):
+    import threading
+    import urllib.request
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from config import ProxyConfig
+    from egress_pool import EgressPool
+    from fetch_configs import ConfigFetcher, HostRateLimiter
+
+    bodies = [text.encode('utf-8') for text in read_files(paths)]
+
+    class SourceHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = bodies[int(self.path.strip('/'))]
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class StandInProxyHandler(SourceHandler):
+        opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+        def do_GET(self):
+            with self.opener.open(self.path, timeout=10) as upstream:
+                body = upstream.read()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    servers = [ThreadingHTTPServer(('127.0.0.1', 0), handler) for handler in (SourceHandler, StandInProxyHandler)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    source_port, proxy_port = (server.server_address[1] for server in servers)
+    urls = [f"http://127.0.0.1:{source_port}/{i}" for i in range(len(bodies))]
+
+    config = ProxyConfig()
+    fetcher = ConfigFetcher(config)
+    fetcher.host_limiter = HostRateLimiter(config.FETCH_MAX_WORKERS, 0)
+    pool = EgressPool([f"http://127.0.0.1:{proxy_port}", f"http://127.0.0.1:{proxy_port}"], size=2)
+
+    def fetch_all():
+        for url in urls:
+            fetcher.fetch_with_retry(url).content
+
+    try:
+        fetcher.egress_pool = pool
+        proxied = best_time(fetch_all)
+        fetcher.egress_pool = None
+        direct = best_time(fetch_all)
+        report(f"{len(urls)} sources through stand-in proxies (direct vs proxied)", direct, proxied)
+        logger.info(f"Requests per proxy: {', '.join(str(egress.requests) for egress in pool.egresses)}")
+    finally:
+        pool.close()
+        fetcher.ssconf_executor.shutdown(wait=False)
+        fetcher.hedge_executor.shutdown(wait=False)
+        for server in servers:
+            server.shutdown()
+
+LEGACY_TRANSPORT_TYPES = {'tcp', 'kcp', 'ws', 'http', 'h2', 'quic', 'grpc', 'httpupgrade', 'splithttp', 'xhttp', 'raw'}
+LEGACY_SS_METHODS = {
+    'aes-128-gcm', 'aes-192-gcm', 'aes-256-gcm', 'chacha20-ietf-poly1305', 'xchacha20-ietf-poly1305',
+    '2022-blake3-aes-128-gcm', '2022-blake3-aes-256-gcm', 'aes-128-cfb', 'aes-192-cfb', 'aes-256-cfb',
+    'aes-128-ctr', 'aes-192-ctr', 'aes-256-ctr', 'chacha20', 'chacha20-ietf', 'rc4-md5'
+}
+LEGACY_URI_FIELDS = {
+    'vless': (443, True, [('sni', None), ('type', 'tcp'), ('path', ''), ('host', None), ('security', 'none'), ('flow', ''),
+                          ('alpn', ''), ('fp', ''), ('pbk', ''), ('sid', ''), ('spx', '')]),
+    'trojan': (443, True, [('sni', None), ('alpn', ''), ('type', 'tcp'), ('path', ''), ('host', None), ('security', 'tls'),
+                           ('fp', ''), ('flow', '')]),
+    'hysteria2': (443, False, [('password', ''), ('sni', None), ('obfs', ''), ('obfs-password', ''), ('insecure', '0'),
+                               ('pinSHA256', '')]),
+    'tuic': (443, True, [('congestion_control', 'bbr'), ('udp_relay_mode', 'native'), ('alpn', 'h3'), ('sni', None),
+                         ('allow_insecure', '0'), ('disable_sni', '0')]),
+    'wireguard': (51820, False, [('privatekey', ''), ('publickey', ''), ('presharedkey', ''), ('reserved', ''), ('mtu', '1420'),
+                                 ('address', '')])
+}
+LEGACY_URI_FIELDS['hy2'] = LEGACY_URI_FIELDS['hysteria2']
+
+def legacy_is_base64(s: str) -> bool:
+    import re
+
+    if not s or len(s) < 4:
+        return False
+    s = s.rstrip('=')
+    return bool(re.match(r'^[A-Za-z0-9+/\-_]+$', s)) and len(s) % 4 in (0, 2, 3)
+
+@lru_cache(maxsize=2048)
+def legacy_safe_b64decode(s: str) -> Optional[str]:
+    import base64
+
+    if not s:
+        return None
+    s = s.replace('-', '+').replace('_', '/')
+    try:
+        return base64.b64decode(s + '=' * (-len(s) % 4), validate=True).decode('utf-8', errors='strict')
+    except (ValueError, UnicodeDecodeError):
+        pass
+    try:
+        return base64.b64decode(s).decode('utf-8', errors='ignore')
+    except Exception:
+        return None
+
+def legacy_parse_config(config: str) -> Optional[Dict]:
+    import json
+    from urllib.parse import urlparse, parse_qs, unquote
+
+    protocol = config.split('://', 1)[0].lower()
+    if protocol == 'vmess':
+        decoded = legacy_safe_b64decode(config[8:].strip())
+        try:
+            data = json.loads(decoded) if decoded else None
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict) or not all(data.get(field) for field in ('add', 'port', 'id')):
+            return None
+        try:
+            data['port'] = int(data['port'])
+        except (ValueError, TypeError):
+            return None
+        data['name'] = data.get('ps', data.get('name', ''))
+        data['net'] = data.get('net', 'tcp').lower()
+        data['tls'] = data.get('tls', 'none').lower()
+        if data['net'] not in LEGACY_TRANSPORT_TYPES:
+            data['net'] = 'tcp'
+        return data
+
+    if protocol == 'ss':
+        url_part, _, fragment = config[5:].partition('#')
+        if '@' in url_part:
+            credential_part, server_part = url_part.split('@', 1)
+            credential = unquote(credential_part)
+            if legacy_is_base64(credential):
+                credential = legacy_safe_b64decode(credential)
+        else:
+            decoded = legacy_safe_b64decode(url_part)
+            if not decoded or '@' not in decoded:
+                return None
+            credential, server_part = decoded.split('@', 1)
+        if ':' not in server_part or not credential or ':' not in credential:
+            return None
+        host, port = server_part.rsplit(':', 1)
+        method, password = credential.split(':', 1)
+        if not password or method.lower().strip() not in LEGACY_SS_METHODS:
+            return None
+        try:
+            return {'method': method.lower().strip(), 'password': password, 'address': host.strip('[]'), 'port': int(port),
+                    'plugin': '', 'name': unquote(fragment) if fragment else ''}
+        except ValueError:
+            return None
+
+    if protocol not in LEGACY_URI_FIELDS:
+        return None
+    default_port, needs_username, fields = LEGACY_URI_FIELDS[protocol]
+    try:
+        url = urlparse(config)
+        if not url.hostname or (needs_username and not url.username):
+            return None
+        data = {'address': url.hostname, 'port': url.port or default_port, 'username': url.username}
+    except ValueError:
+        return None
+    params = parse_qs(url.query)
+    for field, default in fields:
+        data[field] = params.get(field, [url.hostname if default is None else default])[0]
+    if 'type' in data and data['type'].lower() not in LEGACY_TRANSPORT_TYPES:
+        data['type'] = 'tcp'
+    data['name'] = unquote(url.fragment) if url.fragment else ''
+    return data
+
+def bench_endpoint(paths: List[str]):
+    from urllib.parse import urlparse, urlsplit, parse_qs
+    import base64_codec
+    import config_parser as parser
+    from config_provenance import config_endpoint_key
+    from proxy_endpoint import parse_endpoint
+
+    configs = [line.strip() for text in read_files(paths) for line in text.split('\n')
+               if '://' in line and not line.startswith('//')]
+    parser.disable_parse_cache()
+    stages = ['enrich', 'rename', 'xray tester', 'sing-box', 'balancer']
+    clear_urlsplit_cache = getattr(urlsplit, 'cache_clear', lambda: None)
+
+    def legacy_stage(name: str):
+        for config in configs:
+            legacy_parse_config(config)
+            if name == 'rename' and config.startswith(('vless://', 'trojan://', 'hysteria2://', 'hy2://')):
+                try:
+                    parse_qs(urlparse(config).query)
+                except ValueError:
+                    pass
+
+    def endpoint_stage(name: str):
+        for config in configs:
+            endpoint = parse_endpoint(config)
+            if name == 'rename' and endpoint:
+                endpoint.params
+            elif name == 'xray tester':
+                config_endpoint_key(config)
+
+    def run_stages(stage: Callable[[str], None], clear: Callable[[], None], shared: bool):
+        clear()
+        for name in stages:
+            if not shared:
+                clear()
+            stage(name)
+
+    def clear_legacy():
+        legacy_safe_b64decode.cache_clear()
+        clear_urlsplit_cache()
+
+    def clear_endpoint():
+        parse_endpoint.cache_clear()
+        base64_codec.cache.clear()
+        clear_urlsplit_cache()
+
+    for shared, label in ((False, 'one process per stage'), (True, 'stages in one process')):
+        report(f"{len(configs)} configs, {label}",
+               best_time(run_stages, legacy_stage, clear_legacy, shared),
+               best_time(run_stages, endpoint_stage, clear_endpoint, shared))
+
+def bench_parse_cache(paths: List[str]):
+    import tempfile
+    import base64_codec
+    import config_parser as parser
+
+    configs = [line.strip() for text in read_files(paths) for line in text.split('\n')
+               if '://' in line and not line.startswith('//')]
+
+    def parse_all() -> List:
+        return [parser.parse_config(config) for config in configs]
+
+    parser.disable_parse_cache()
+    base64_codec.cache.clear()
+    expected = parse_all()
+    uncached = best_time(lambda: (base64_codec.cache.clear(), parse_all()))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_file = os.path.join(temp_dir, 'parse_cache.bin')
+
+        def next_step():
+            base64_codec.cache.clear()
+            cache = parser.enable_parse_cache(cache_file)
+            results = parse_all()
+            cache.save()
+            return results
+
+        def first_step():
+            if os.path.exists(cache_file):
+                os.unlink(cache_file)
+            next_step()
+
+        report(f"{len(configs)} configs, first step (filling the cache)", uncached, best_time(first_step))
+        if next_step() != expected:
+            logger.warning("Cached parse results differ from the parser output")
+        report(f"{len(configs)} configs, next steps (loading the cache)", uncached, best_time(next_step))
+        hits, misses, entries = parser.parse_cache.stats()
+        logger.info(f"Cache file: {os.path.getsize(cache_file) / 1024:.0f}KB, {entries} entries, "
+                    f"{hits} hits, {misses} misses in the last step")
+        parser.disable_parse_cache()
+
+def legacy_decode_base64_text(text: str) -> Optional[str]:
+    import re
+    import base64
+
+    try:
+        if re.match(r'^[A-Za-z0-9+/\-_]*$', text.rstrip('=')):
+            s = text.replace('-', '+').replace('_', '/')
+            padding = 4 - (len(s) % 4)
+            if padding != 4:
+                s += '=' * padding
+            decoded = base64.b64decode(s)
+            if decoded:
+                return decoded.decode('utf-8')
+        return None
+    except Exception:
+        return None
+
+def bench_base64(paths: List[str]):
+    import base64
+    import base64_codec
+
+    bodies = []
+    for text in read_files(paths):
+        lines = [line.strip() for line in text.split('\n') if line.strip() and not line.startswith('//')]
+        plain = '\n'.join(lines)
+        bodies.append(plain)
+        bodies.append(base64.b64encode(plain.encode('utf-8')).decode('ascii'))
+        bodies.append('\n'.join(base64.urlsafe_b64encode(line.encode('utf-8')).decode('ascii').rstrip('=') for line in lines))
+    tokens = [part for body in bodies for line in body.split('\n') for part in line.split()]
+
+    def legacy():
+        return [legacy_decode_base64_text(token) for token in tokens]
+
+    expected = legacy()
+    if base64_codec.decode_many(tokens) != expected:
+        logger.warning("Batch decode results differ from the previous implementation")
+
+    def cold():
+        base64_codec.cache.clear()
+        return base64_codec.decode_many(tokens)
+
+    total_bytes = sum(len(token) for token in tokens)
+    baseline = best_time(legacy)
+    report(f"{len(tokens)} tokens, {total_bytes / 2**20:.1f}MB, empty cache", baseline, best_time(cold))
+    report(f"{len(tokens)} tokens, {total_bytes / 2**20:.1f}MB, warm cache", baseline, best_time(base64_codec.decode_many, tokens))
+    report(f"{len(tokens)} tokens, one call per token", baseline,
+           best_time(lambda: [base64_codec.decode_text(token) for token in tokens]))
+    stats = base64_codec.cache.stats()
+    logger.info(f"Cache: {stats['entries']} entries, {stats['bytes'] / 1024:.0f}KB, {stats['hits']} hits, "
+                f"{stats['misses']} misses, {stats['evictions']} evictions")
+
+def legacy_validate(config: str) -> Optional[str]:
+    import re
+    import json
+    from urllib.parse import unquote, urlparse
+
+    def is_base64(s: str) -> bool:
+        return bool(re.match(r'^[A-Za-z0-9+/\-_]*$', s.rstrip('=')))
+
+    if config.startswith('hy2://'):
+        config = config.replace('hy2://', 'hysteria2://', 1)
+    protocol = next((p for p in ('wireguard://', 'hysteria2://', 'vless://', 'vmess://', 'ss://', 'trojan://', 'tuic://')
+                     if config.startswith(p)), None)
+    if not protocol:
+        return None
+    if protocol == 'vmess://':
+        config = f"vmess://{re.split(r'[^A-Za-z0-9+/=_-]', config[8:])[0]}"
+    config = re.sub(r'[\U0001F300-\U0001F9FF]', '', config)
+    config = re.sub(r'[\x00-\x08\x0B-\x1F\x7F-\x9F]', '', config)
+    config = re.sub(r'[^\S\r\n]+', ' ', config).strip()
+
+    try:
+        if protocol == 'vmess://':
+            decoded = legacy_decode_base64_url(config[8:])
+            if not decoded:
+                return None
+            json.loads(decoded)
+        elif protocol == 'tuic://':
+            netloc = urlparse(config).netloc
+            if not (netloc and ':' in netloc):
+                return None
+        elif protocol in ('vless://', 'ss://'):
+            base64_part = config[len(protocol):]
+            decoded_url = unquote(base64_part)
+            if not (is_base64(decoded_url) or is_base64(base64_part) or
+                    legacy_decode_base64_url(base64_part) or legacy_decode_base64_url(decoded_url)):
+                return None
+        elif '@' not in urlparse(config).netloc:
+            return None
+    except Exception:
+        return None
+    return config
+
+def legacy_decode_base64_url(s: str) -> Optional[bytes]:
+    import base64
+
+    try:
+        s = s.replace('-', '+').replace('_', '/')
+        padding = 4 - (len(s) % 4)
+        if padding != 4:
+            s += '=' * padding
+        return base64.b64decode(s)
+    except Exception:
+        return None
+
+def bench_validate(paths: List[str]):
+    import base64_codec
+    import config_parser as parser
+    from urllib.parse import urlsplit
+    from config_validator import ConfigValidator
+    from fetch_configs import ConfigFetcher
+    from proxy_endpoint import canonical_key, parse_endpoint
+
+    parser.disable_parse_cache()
+    configs = list(dict.fromkeys(line.strip() for text in read_files(paths) for line in text.split('\n')
+                                 if '://' in line and not line.startswith('//')))
+    clear_urlsplit_cache = getattr(urlsplit, 'cache_clear', lambda: None)
+
+    def clear_caches():
+        base64_codec.cache.clear()
+        parse_endpoint.cache_clear()
+        clear_urlsplit_cache()
+
+    def legacy() -> List:
+        clear_caches()
+        results = []
+        for config in configs:
+            clean_config = legacy_validate(config)
+            results.append(clean_config and (clean_config, canonical_key(clean_config) or clean_config))
+        return results
+
+    def fast_path() -> List:
+        clear_caches()
+        return [validated and (validated.config, ConfigFetcher.config_key(validated))
+                for validated in ConfigValidator.validate_many(configs)]
+
+    expected = legacy()
+    mismatched = sum(1 for a, b in zip(expected, fast_path()) if a != b)
+    if mismatched:
+        logger.warning(f"{mismatched} configs validate differently from the previous implementation")
+    logger.info(f"{sum(1 for result in expected if result)} of {len(configs)} configs are valid")
+    report(f"{len(configs)} configs, validate and key", best_time(legacy), best_time(fast_path))
+
+    def legacy_validate_only():
+        clear_caches()
+        return [legacy_validate(config) for config in configs]
+
+    report(f"{len(configs)} configs, validate only", best_time(legacy_validate_only),
+           best_time(lambda: (clear_caches(), ConfigValidator.validate_many(configs))))
+
+def bench_uri(paths: List[str]):
+    from urllib.parse import urlparse, urlsplit, parse_qs, unquote
+    from config_parser import split_uri
+
+    uris = [line.strip() for text in read_files(paths) for line in text.split('\n')
+            if line.strip().startswith(('vless://', 'trojan://', 'hysteria2://', 'hy2://', 'tuic://', 'wireguard://'))]
+    if not uris:
+        return
+
+    def stdlib():
+        for uri in uris:
+            url = urlparse(uri)
+            url.username, url.hostname, url.port, parse_qs(url.query), unquote(url.fragment)
+
+    def tokenizer():
+        for uri in uris:
+            parts = split_uri(uri)
+            parts.username, parts.hostname, parts.port, parts.params, parts.fragment
+
+    clear_urlsplit_cache = getattr(urlsplit, 'cache_clear', lambda: None)
+    baseline = best_time(lambda: (clear_urlsplit_cache(), stdlib()))
+    candidate = best_time(tokenizer)
+    report(f"{len(uris)} URIs", baseline, candidate)
+    logger.info(f"Tokenizer throughput: {len(uris) / candidate:,.0f} URIs/s")
+
+BENCHMARKS: Dict[str, Callable[[List[str]], None]] = {
+    'telegram': bench_telegram,
+    'split': bench_split,
+    'dedupe': bench_dedupe,
+    'egress': bench_egress,
+    'endpoint': bench_endpoint,
+    'parse_cache': bench_parse_cache,
+    'uri': bench_uri,
+    'base64': bench_base64,
+    'validate': bench_validate
+}
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in BENCHMARKS:
+        print(f"Usage: python benchmark.py <{'|'.join(BENCHMARKS)}> <file> [file ...]")
+        sys.exit(1)
+
+    BENCHMARKS[sys.argv[1]](sys.argv[2:])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+class HostCircuitBreaker:
+    def __init__(self, state_file: str, failure_threshold: int, base_delay: float, max_delay: float):
+        self.state_file = state_file
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_delay = base_delay
+        self.max_delay = max(base_delay, max_delay)
+        self.lock = threading.Lock()
+        self.hosts: Dict[str, Dict] = {}
+        self.probing = set()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.hosts = {host: state for host, state in data.get('hosts', {}).items() if isinstance(state, dict)}
+            open_hosts = sum(1 for state in self.hosts.values() if state.get('open_until', 0) > time.time())
+            logger.info(f"Loaded circuit breaker state for {len(self.hosts)} hosts ({open_hosts} open)")
+        except FileNotFoundError:
+            self.hosts = {}
+        except Exception as e:
+            logger.warning(f"Error loading circuit breaker state, starting empty: {str(e)}")
+            self.hosts = {}
+
+    def save(self):
+        try:
+            with self.lock:
+                data = {'hosts': dict(self.hosts)}
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            logger.info(f"Circuit breaker state saved to {self.state_file}")
+        except Exception as e:
+            logger.error(f"Error saving circuit breaker state: {str(e)}")
+
+    def allow(self, host: str) -> bool:
+        with self.lock:
+            state = self.hosts.get(host)
+            if not state or not state.get('open_until'):
+                return True
+            if time.time() < state['open_until'] or host in self.probing:
+                return False
+            self.probing.add(host)
+            logger.info(f"Re-probing {host} after {state.get('delay', 0):.0f}s open circuit")
+            return True
+
+    def record_success(self, host: str):
+        with self.lock:
+            self.probing.discard(host)
+            if self.hosts.pop(host, None):
+                logger.info(f"Circuit closed for {host}")
+
+    def record_failure(self, host: str):
+        with self.lock:
+            state = self.hosts.setdefault(host, {'failures': 0, 'open_until': 0, 'delay': 0})
+            state['failures'] += 1
+            was_probe = host in self.probing
+            self.probing.discard(host)
+
+            if was_probe or state['failures'] >= self.failure_threshold:
+                previous_delay = state.get('delay', 0)
+                state['delay'] = min(self.max_delay, previous_delay * 2 if previous_delay else self.base_delay)
+                state['open_until'] = time.time() + state['delay']
+                logger.warning(f"Circuit opened for {host} for {state['delay']:.0f}s after {state['failures']} failures")
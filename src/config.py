@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import re
+import json
 from urllib.parse import urlparse
 from dataclasses import dataclass
 import logging
@@ -8,7 +9,14 @@ from math import inf
 
 from user_settings import (
     SOURCE_URLS, USE_MAXIMUM_POWER, SPECIFIC_CONFIG_COUNT, ENABLED_PROTOCOLS,
-    MAX_CONFIG_AGE_DAYS, ENABLE_SINGBOX_TESTER, SINGBOX_TESTER_MAX_WORKERS,
+    MAX_CONFIG_AGE_DAYS, FETCH_MAX_WORKERS, FETCH_PER_HOST_LIMIT, FETCH_PER_HOST_DELAY,
+    ENABLE_SOURCE_CACHE, TELEGRAM_MAX_PAGES, FETCH_REQUEST_BUDGET_SECONDS, FETCH_RUN_BUDGET_SECONDS,
+    FETCH_HEDGE_DELAY_SECONDS,
+    ENABLE_ADAPTIVE_SCHEDULING, SCHEDULE_MIN_INTERVAL_HOURS, SCHEDULE_MAX_INTERVAL_HOURS,
+    ENABLE_COMPACT_DEDUPE, DEDUPE_SPILL_TO_DISK,
+    ENABLE_REDUNDANT_CHANNEL_PRUNING, REDUNDANT_CHANNEL_MIN_UNIQUE_RATIO, REDUNDANT_CHANNEL_RUNS,
+    ENABLE_PROXY_FETCH, PROXY_FETCH_POOL_SIZE, PROXY_FETCH_URLS,
+    ENABLE_SINGBOX_TESTER, SINGBOX_TESTER_MAX_WORKERS,
     SINGBOX_TESTER_TIMEOUT_SECONDS, SINGBOX_TESTER_URLS, ENABLE_XRAY_TESTER,
     XRAY_TESTER_MAX_WORKERS, XRAY_TESTER_TIMEOUT_SECONDS, XRAY_TESTER_URLS,
     LOCATION_APIS
@@ -27,29 +35,52 @@ class ChannelMetrics:
     fail_count: int = 0
     success_count: int = 0
     overall_score: float = 0.0
+    new_config_rate: float = 0.0
+    working_ratio: Optional[float] = None
+    tested_configs: int = 0
+    exclusive_ratio: Optional[float] = None
+    low_contribution_runs: int = 0
     protocol_counts: Dict[str, int] = None
+    phase_times: Dict[str, float] = None
+    phase_bytes: Dict[str, int] = None
 
     
     def __post_init__(self):
         if self.protocol_counts is None:
             self.protocol_counts = {}
+        if self.phase_times is None:
+            self.phase_times = {}
+        if self.phase_bytes is None:
+            self.phase_bytes = {}
 
 class ChannelConfig:
-    def __init__(self, url: str):
+    def __init__(self, url: str, mirrors: Optional[List[str]] = None):
         self.url = self._validate_url(url)
+        self.mirrors = [self._validate_url(mirror) for mirror in (mirrors or []) if mirror and mirror.strip() != self.url]
+        self.preferred_url = self.url
         self.enabled = True
         self.metrics = ChannelMetrics()
         self.is_telegram = bool(re.match(r'^https://t\.me/s/', self.url))
+        self.is_local = self.url.startswith('file://')
         self.error_count = 0
         self.last_check_time = None
+        self.fetch_interval = 0.0
+        self.next_due_time = None
         
     def _validate_url(self, url: str) -> str:
         if not url or not isinstance(url, str):
             raise ValueError("Invalid URL")
         url = url.strip()
-        if not url.startswith(('http://', 'https://', 'ssconf://')):
+        if not url.startswith(('http://', 'https://', 'ssconf://', 'file://')):
             raise ValueError("Invalid URL protocol")
         return url
+    
+    def get_endpoints(self) -> List[str]:
+        endpoints = [self.url] + self.mirrors
+        if self.preferred_url in endpoints:
+            endpoints.remove(self.preferred_url)
+            endpoints.insert(0, self.preferred_url)
+        return endpoints
         
     
     def calculate_overall_score(self):
@@ -67,7 +98,11 @@ class ChannelConfig:
             if self.metrics.avg_response_time > 0:
                 response_score = max(0, min(15, 15 * (1 - (self.metrics.avg_response_time / 10))))
             
-            self.metrics.overall_score = round(reliability_score + quality_score + uniqueness_score + response_score, 2)
+            overall_score = reliability_score + quality_score + uniqueness_score + response_score
+            if self.metrics.working_ratio is not None:
+                overall_score = (overall_score * 0.6) + (self.metrics.working_ratio * 100 * 0.4)
+            
+            self.metrics.overall_score = round(overall_score, 2)
         except Exception as e:
             logger.error(f"Error calculating score for {self.url}: {str(e)}")
             self.metrics.overall_score = 0.0
@@ -78,6 +113,26 @@ class ProxyConfig:
         self.specific_config_count = SPECIFIC_CONFIG_COUNT
         self.MAX_CONFIG_AGE_DAYS = MAX_CONFIG_AGE_DAYS
         
+        self.FETCH_MAX_WORKERS = max(1, FETCH_MAX_WORKERS)
+        self.FETCH_PER_HOST_LIMIT = max(1, FETCH_PER_HOST_LIMIT)
+        self.FETCH_PER_HOST_DELAY = max(0, FETCH_PER_HOST_DELAY)
+        self.ENABLE_SOURCE_CACHE = ENABLE_SOURCE_CACHE
+        self.TELEGRAM_MAX_PAGES = max(1, TELEGRAM_MAX_PAGES)
+        self.FETCH_REQUEST_BUDGET = max(10, FETCH_REQUEST_BUDGET_SECONDS)
+        self.FETCH_RUN_BUDGET = max(60, FETCH_RUN_BUDGET_SECONDS)
+        self.FETCH_HEDGE_DELAY = max(0, FETCH_HEDGE_DELAY_SECONDS)
+        self.ENABLE_ADAPTIVE_SCHEDULING = ENABLE_ADAPTIVE_SCHEDULING
+        self.SCHEDULE_MIN_INTERVAL = max(0, SCHEDULE_MIN_INTERVAL_HOURS)
+        self.SCHEDULE_MAX_INTERVAL = max(self.SCHEDULE_MIN_INTERVAL, SCHEDULE_MAX_INTERVAL_HOURS)
+        self.ENABLE_COMPACT_DEDUPE = ENABLE_COMPACT_DEDUPE
+        self.DEDUPE_SPILL_TO_DISK = DEDUPE_SPILL_TO_DISK
+        self.ENABLE_REDUNDANT_CHANNEL_PRUNING = ENABLE_REDUNDANT_CHANNEL_PRUNING
+        self.REDUNDANT_CHANNEL_MIN_UNIQUE_RATIO = max(0.0, REDUNDANT_CHANNEL_MIN_UNIQUE_RATIO)
+        self.REDUNDANT_CHANNEL_RUNS = max(1, REDUNDANT_CHANNEL_RUNS)
+        self.ENABLE_PROXY_FETCH = ENABLE_PROXY_FETCH
+        self.PROXY_FETCH_POOL_SIZE = max(1, PROXY_FETCH_POOL_SIZE)
+        self.PROXY_FETCH_URLS = list(PROXY_FETCH_URLS or [])
+        
         self.ENABLE_CONFIG_TESTER = ENABLE_SINGBOX_TESTER
         self.TESTER_MAX_WORKERS = SINGBOX_TESTER_MAX_WORKERS
         self.TESTER_TIMEOUT_SECONDS = SINGBOX_TESTER_TIMEOUT_SECONDS
@@ -90,10 +145,11 @@ class ProxyConfig:
         
         self.LOCATION_APIS = LOCATION_APIS
 
-        initial_urls = [ChannelConfig(url=url) for url in SOURCE_URLS]
+        self._initialize_settings()
+        initial_urls = [self._create_channel(source) for source in SOURCE_URLS]
         self.SOURCE_URLS = self._remove_duplicate_urls(initial_urls)
+        self._load_channel_history()
         self.SUPPORTED_PROTOCOLS = self._initialize_protocols()
-        self._initialize_settings()
         self._set_smart_limits()
 
     def _initialize_protocols(self) -> Dict:
@@ -112,9 +168,40 @@ class ProxyConfig:
         self.CHANNEL_ERROR_THRESHOLD = min(0.9, max(0.1, 0.7))
         self.OUTPUT_FILE = 'configs/proxy_configs.txt'
         self.STATS_FILE = 'configs/channel_stats.json'
+        self.SOURCE_CACHE_FILE = 'configs/source_cache.json'
+        self.CIRCUIT_BREAKER_FILE = 'configs/host_health.json'
+        self.CIRCUIT_BREAKER_THRESHOLD = 3
+        self.CIRCUIT_BREAKER_BASE_DELAY = 3600
+        self.CIRCUIT_BREAKER_MAX_DELAY = 7 * 24 * 3600
+        self.CHANNEL_MIN_SCORE = 25
+        self.CHANNEL_DEFAULT_SCORE = 50
+        self.CHANNEL_REPROBE_HOURS = 24
+        self.CHANNEL_MIN_WORKING_RATIO = 0.05
+        self.CHANNEL_MIN_TESTED_CONFIGS = 20
+        self.CHANNEL_YIELD_ALPHA = 0.5
+        self.PROVENANCE_FILE = 'configs/config_sources.json'
+        self.SCHEDULE_TARGET_NEW_CONFIGS = 5
+        self.QUOTA_HEADROOM = 1.5
+        self.RANK_WEIGHT_FRESHNESS = 0.4
+        self.RANK_WEIGHT_CHANNEL = 0.4
+        self.RANK_WEIGHT_REPOSTS = 0.2
+        self.RANK_MAX_REPOSTS = 5
+        self.PROXY_FETCH_CONFIGS_FILE = 'configs/proxy_configs_tested.txt'
+        self.PROXY_FETCH_FAILURE_THRESHOLD = 2
+        self.PROXY_FETCH_STARTUP_TIMEOUT = 5
+        self.SCHEDULE_RATE_ALPHA = 0.3
+        self.SCHEDULE_TOLERANCE_HOURS = 2
         self.MAX_RETRIES = min(10, max(1, 5))
         self.RETRY_DELAY = min(60, max(5, 15))
+        self.RETRY_MAX_DELAY = 60
         self.REQUEST_TIMEOUT = min(120, max(10, 60))
+        self.STREAM_CHUNK_SIZE = 64 * 1024
+        self.SSCONF_MAX_WORKERS = 8
+        self.SSCONF_MAX_RETRIES = 1
+        self.SSCONF_TIMEOUT = 10
+        self.SSCONF_DEADLINE = 15
+        self.OVERLAP_REPORT_MIN_JACCARD = 0.3
+        self.OVERLAP_REPORT_MAX_PAIRS = 50
         
         self.HEADERS = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -173,6 +260,8 @@ class ProxyConfig:
                 url = url.replace('ssconf://', 'https://', 1)
                 
             parsed = urlparse(url)
+            if parsed.scheme == 'file' and parsed.path:
+                return f"file://{parsed.netloc}{parsed.path.rstrip('/')}"
             if not parsed.scheme or not parsed.netloc:
                 raise ValueError("Invalid URL format")
                 
@@ -187,6 +276,13 @@ class ProxyConfig:
             logger.error(f"URL normalization error: {str(e)}")
             raise
 
+    def _create_channel(self, source) -> ChannelConfig:
+        if isinstance(source, (list, tuple)):
+            if not source:
+                raise ValueError("Invalid URL")
+            return ChannelConfig(url=source[0], mirrors=list(source[1:]))
+        return ChannelConfig(url=source)
+
     def _remove_duplicate_urls(self, channel_configs: List[ChannelConfig]) -> List[ChannelConfig]:
         try:
             seen_urls = {}
@@ -216,6 +312,91 @@ class ProxyConfig:
             self.save_empty_config_file()
             return []
 
+    def _load_channel_history(self):
+        try:
+            with open(self.STATS_FILE, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Error loading channel history from {self.STATS_FILE}: {str(e)}")
+            return
+        
+        history = {entry.get('url'): entry for entry in stats.get('channels', []) if isinstance(entry, dict)}
+        now = datetime.now(timezone.utc)
+        skipped = 0
+        
+        for channel in self.SOURCE_URLS:
+            entry = history.get(channel.url)
+            if not entry:
+                continue
+            
+            try:
+                metrics = entry.get('metrics', {})
+                channel.metrics.success_count = int(metrics.get('success_count', 0))
+                channel.metrics.fail_count = int(metrics.get('fail_count', 0))
+                channel.metrics.avg_response_time = float(metrics.get('avg_response_time', 0))
+                channel.metrics.overall_score = float(metrics.get('overall_score', 0))
+                channel.metrics.new_config_rate = float(metrics.get('new_config_rate', 0))
+                if metrics.get('working_ratio') is not None:
+                    channel.metrics.working_ratio = float(metrics['working_ratio'])
+                channel.metrics.tested_configs = int(metrics.get('tested_configs', 0))
+                if metrics.get('exclusive_ratio') is not None:
+                    channel.metrics.exclusive_ratio = float(metrics['exclusive_ratio'])
+                channel.metrics.low_contribution_runs = int(metrics.get('low_contribution_runs', 0))
+                schedule = entry.get('schedule') or {}
+                channel.fetch_interval = float(schedule.get('fetch_interval_hours', 0))
+                if entry.get('preferred_endpoint') in channel.get_endpoints():
+                    channel.preferred_url = entry['preferred_endpoint']
+                if schedule.get('next_due'):
+                    next_due = datetime.fromisoformat(schedule['next_due'])
+                    channel.next_due_time = next_due if next_due.tzinfo else next_due.replace(tzinfo=timezone.utc)
+                if metrics.get('last_success'):
+                    channel.metrics.last_success_time = datetime.fromisoformat(metrics['last_success'])
+                if entry.get('last_check'):
+                    last_check = datetime.fromisoformat(entry['last_check'])
+                    channel.last_check_time = last_check if last_check.tzinfo else last_check.replace(tzinfo=timezone.utc)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Ignoring invalid history for {channel.url}: {str(e)}")
+                continue
+            
+            if entry.get('enabled', True) or not (self.is_channel_underperforming(channel) or self.is_channel_redundant(channel)):
+                continue
+            
+            reprobe_time = channel.last_check_time + timedelta(hours=self.CHANNEL_REPROBE_HOURS) if channel.last_check_time else None
+            if reprobe_time and now < reprobe_time:
+                channel.enabled = False
+                skipped += 1
+        
+        if skipped:
+            logger.info(f"Skipping {skipped} low-scoring channels until their next re-probe")
+
+    def is_channel_redundant(self, channel: ChannelConfig) -> bool:
+        return (self.ENABLE_REDUNDANT_CHANNEL_PRUNING and
+                channel.metrics.low_contribution_runs >= self.REDUNDANT_CHANNEL_RUNS)
+
+    def is_channel_underperforming(self, channel: ChannelConfig) -> bool:
+        if channel.metrics.overall_score < self.CHANNEL_MIN_SCORE:
+            return True
+        return (channel.metrics.working_ratio is not None and
+                channel.metrics.tested_configs >= self.CHANNEL_MIN_TESTED_CONFIGS and
+                channel.metrics.working_ratio < self.CHANNEL_MIN_WORKING_RATIO)
+
+    def update_channel_yield(self, channel: ChannelConfig, tested: int, working: int):
+        ratio = working / max(1, tested)
+        if channel.metrics.working_ratio is None:
+            channel.metrics.working_ratio = ratio
+        else:
+            alpha = self.CHANNEL_YIELD_ALPHA
+            channel.metrics.working_ratio = (channel.metrics.working_ratio * (1 - alpha)) + (ratio * alpha)
+        channel.metrics.tested_configs = tested
+        logger.info(f"{channel.url}: {working}/{tested} configs passed testing (working ratio {channel.metrics.working_ratio:.2f})")
+
+    def get_channel_priority(self, channel: ChannelConfig) -> float:
+        if channel.metrics.success_count + channel.metrics.fail_count == 0:
+            return self.CHANNEL_DEFAULT_SCORE
+        return channel.metrics.overall_score
+
     def is_protocol_enabled(self, protocol: str) -> bool:
         try:
             if not protocol:
@@ -236,12 +417,14 @@ class ProxyConfig:
 
     def get_enabled_channels(self) -> List[ChannelConfig]:
         channels = [channel for channel in self.SOURCE_URLS if channel.enabled]
+        channels.sort(key=self.get_channel_priority, reverse=True)
         if not channels:
             self.save_empty_config_file()
             logger.error("No enabled channels found. Empty config file created.")
         return channels
 
     def update_channel_stats(self, channel: ChannelConfig, success: bool, response_time: float = 0):
+        channel.last_check_time = datetime.now(timezone.utc)
         if success:
             channel.metrics.success_count += 1
             channel.metrics.last_success_time = datetime.now()
@@ -256,7 +439,7 @@ class ProxyConfig:
         
         channel.calculate_overall_score()
         
-        if channel.metrics.overall_score < 25:
+        if self.is_channel_underperforming(channel):
             channel.enabled = False
         
         if not any(c.enabled for c in self.SOURCE_URLS):
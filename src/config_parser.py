@@ -1,14 +1,49 @@
 import json
-import base64
 import re
+import atexit
 import logging
-from typing import Dict, Optional
-from urllib.parse import urlparse, parse_qs, unquote
-import binascii
-from functools import lru_cache
+import ipaddress
+import unicodedata
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote
+from functools import wraps
+import base64_codec
+from digest_set import config_digest
+from parse_cache import ParseCache, MISSING, source_version
+from user_settings import ENABLE_PARSE_CACHE, PARSE_CACHE_MAX_MB
 
 logger = logging.getLogger(__name__)
 
+PARSE_CACHE_FILE = 'configs/parse_cache.bin'
+parse_cache: Optional[ParseCache] = None
+
+def enable_parse_cache(cache_file: str = PARSE_CACHE_FILE, max_bytes: int = PARSE_CACHE_MAX_MB * 2**20) -> ParseCache:
+    global parse_cache
+    disable_parse_cache()
+    parse_cache = ParseCache(cache_file, source_version(__file__, base64_codec.__file__), max_bytes)
+    atexit.register(parse_cache.save)
+    return parse_cache
+
+def disable_parse_cache():
+    global parse_cache
+    if parse_cache:
+        atexit.unregister(parse_cache.save)
+        parse_cache = None
+
+def cached_parse(func: Callable[[str], Optional[Dict]]) -> Callable[[str], Optional[Dict]]:
+    @wraps(func)
+    def wrapper(config: str) -> Optional[Dict]:
+        cache = parse_cache
+        if cache is None or not isinstance(config, str):
+            return func(config)
+        
+        key = config_digest(f"{func.__name__}\0{config}")
+        result = cache.get(key)
+        if result is MISSING:
+            result = cache.put(key, func(config))
+        return result
+    return wrapper
+
 VALID_SS_METHODS = {
     'aes-128-gcm', 'aes-192-gcm', 'aes-256-gcm',
     'chacha20-ietf-poly1305', 'xchacha20-ietf-poly1305',
@@ -22,34 +57,128 @@ VALID_VLESS_FLOWS = {'', 'xtls-rprx-origin', 'xtls-rprx-direct', 'xtls-rprx-visi
 VALID_VLESS_SECURITY = {'none', 'tls', 'reality', 'xtls'}
 VALID_TRANSPORT_TYPES = {'tcp', 'kcp', 'ws', 'http', 'h2', 'quic', 'grpc', 'httpupgrade', 'splithttp', 'xhttp', 'raw'}
 
-def is_base64(s: str) -> bool:
-    if not s or len(s) < 4:
-        return False
-    try:
-        s = s.rstrip('=')
-        return bool(re.match(r'^[A-Za-z0-9+/\-_]+$', s)) and len(s) % 4 in (0, 2, 3)
-    except Exception:
-        return False
+URL_STRIPPED_CHARS = ''.join(chr(c) for c in range(0x21))
+URL_SCHEME_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-.')
+IPV_FUTURE_PATTERN = re.compile(r'\Av[a-fA-F0-9]+\..+\Z')
 
-@lru_cache(maxsize=2048)
-def safe_b64decode(s: str) -> Optional[str]:
-    if not s:
-        return None
-    try:
-        s = s.replace('-', '+').replace('_', '/')
-        padding = '=' * (-len(s) % 4)
-        decoded = base64.b64decode(s + padding, validate=True)
-        return decoded.decode('utf-8', errors='strict')
-    except (binascii.Error, UnicodeDecodeError, ValueError):
-        pass
-    
-    try:
-        s_original = s.replace('-', '+').replace('_', '/')
-        decoded = base64.b64decode(s_original)
-        return decoded.decode('utf-8', errors='ignore')
-    except Exception:
+class URIParts:
+    __slots__ = ('username', 'password', 'hostname', 'port_text', 'query', 'params', 'fragment')
+
+    def __init__(self, username: Optional[str], password: Optional[str], hostname: Optional[str],
+                 port_text: Optional[str], query: str, fragment: str):
+        self.username = username
+        self.password = password
+        self.hostname = hostname
+        self.port_text = port_text
+        self.query = query
+        self.params = parse_query(query)
+        self.fragment = unquote(fragment) if '%' in fragment else fragment
+
+    @property
+    def port(self) -> Optional[int]:
+        if self.port_text is None:
+            return None
+        if not (self.port_text.isdigit() and self.port_text.isascii()):
+            raise ValueError(f"Port could not be cast to integer value as {self.port_text!r}")
+        port = int(self.port_text)
+        if not 0 <= port <= 65535:
+            raise ValueError("Port out of range 0-65535")
+        return port
+
+def parse_query(query: str) -> Dict[str, str]:
+    params = {}
+    if not query:
+        return params
+    for field in query.split('&'):
+        name, has_value, value = field.partition('=')
+        if not value:
+            continue
+        if '+' in name or '%' in name:
+            name = unquote(name.replace('+', ' '))
+        if name in params:
+            continue
+        if '+' in value or '%' in value:
+            value = unquote(value.replace('+', ' '))
+        params[name] = value
+    return params
+
+def is_valid_netloc(netloc: str) -> bool:
+    if '[' in netloc or ']' in netloc:
+        if '[' not in netloc or ']' not in netloc:
+            return False
+        bracketed = netloc.partition('[')[2].partition(']')[0]
+        if bracketed.startswith('v'):
+            if not IPV_FUTURE_PATTERN.match(bracketed):
+                return False
+        else:
+            try:
+                if isinstance(ipaddress.ip_address(bracketed), ipaddress.IPv4Address):
+                    return False
+            except ValueError:
+                return False
+    
+    if not netloc.isascii():
+        stripped = netloc.replace('@', '').replace(':', '').replace('#', '').replace('?', '')
+        normalized = unicodedata.normalize('NFKC', stripped)
+        if normalized != stripped and any(c in normalized for c in '/?#@:'):
+            return False
+    return True
+
+def split_netloc(uri: str) -> Optional[Tuple[str, str]]:
+    if '\t' in uri or '\r' in uri or '\n' in uri:
+        uri = uri.replace('\t', '').replace('\r', '').replace('\n', '')
+    if uri[:1] <= ' ':
+        uri = uri.lstrip(URL_STRIPPED_CHARS)
+    
+    rest = uri
+    colon = uri.find(':')
+    if colon > 0 and uri[0].isascii() and uri[0].isalpha() and all(c in URL_SCHEME_CHARS for c in uri[:colon]):
+        rest = uri[colon + 1:]
+    
+    netloc = ''
+    if rest.startswith('//'):
+        end = len(rest)
+        for delimiter in '/?#':
+            position = rest.find(delimiter, 2, end)
+            if position != -1:
+                end = position
+        netloc = rest[2:end]
+        rest = rest[end:]
+        if not is_valid_netloc(netloc):
+            return None
+    return netloc, rest
+
+def split_uri(uri: str) -> Optional[URIParts]:
+    split = split_netloc(uri)
+    if split is None:
         return None
+    netloc, rest = split
+    
+    rest, _, fragment = rest.partition('#')
+    query = rest.partition('?')[2]
+    
+    userinfo, has_userinfo, hostinfo = netloc.rpartition('@')
+    if has_userinfo:
+        username, has_password, password = userinfo.partition(':')
+        if not has_password:
+            password = None
+    else:
+        username = password = None
+    
+    _, has_bracket, bracketed = hostinfo.partition('[')
+    if has_bracket:
+        hostname, _, port_text = bracketed.partition(']')
+        port_text = port_text.partition(':')[2]
+    else:
+        hostname, _, port_text = hostinfo.partition(':')
+    
+    if hostname:
+        hostname, percent, zone = hostname.partition('%')
+        hostname = hostname.lower() + percent + zone
+    
+    return URIParts(username, password, hostname or None, port_text or None, query, fragment)
 
+@cached_parse
 def decode_vmess(config: str) -> Optional[Dict]:
     if not config or not isinstance(config, str) or not config.startswith('vmess://'):
         return None
@@ -58,7 +187,7 @@ def decode_vmess(config: str) -> Optional[Dict]:
     if not encoded:
         return None
     
-    decoded = safe_b64decode(encoded)
+    decoded = base64_codec.safe_decode(encoded)
     if not decoded:
         return None
     
@@ -67,6 +196,9 @@ def decode_vmess(config: str) -> Optional[Dict]:
     except json.JSONDecodeError:
         return None
     
+    return normalize_vmess(data)
+
+def normalize_vmess(data) -> Optional[Dict]:
     if not isinstance(data, dict):
         return None
     
@@ -88,30 +220,31 @@ def decode_vmess(config: str) -> Optional[Dict]:
     
     return data
 
+@cached_parse
 def parse_vless(config: str) -> Optional[Dict]:
     if not config or not isinstance(config, str) or not config.startswith('vless://'):
         return None
     
     try:
-        url = urlparse(config)
+        url = split_uri(config)
     except Exception:
         return None
     
-    if not url.hostname or not url.username:
+    if not url or not url.hostname or not url.username:
         return None
     
     port = url.port or 443
     
-    params = parse_qs(url.query)
-    security = params.get('security', ['none'])[0].lower()
+    params = url.params
+    security = params.get('security', 'none').lower()
     if security not in VALID_VLESS_SECURITY:
         security = 'none'
     
-    flow = params.get('flow', [''])[0].lower()
+    flow = params.get('flow', '').lower()
     if flow and flow not in VALID_VLESS_FLOWS:
         flow = ''
     
-    transport_type = params.get('type', ['tcp'])[0].lower()
+    transport_type = params.get('type', 'tcp').lower()
     if transport_type not in VALID_TRANSPORT_TYPES:
         transport_type = 'tcp'
     
@@ -120,35 +253,36 @@ def parse_vless(config: str) -> Optional[Dict]:
         'address': url.hostname,
         'port': port,
         'flow': flow,
-        'sni': params.get('sni', [url.hostname])[0],
+        'sni': params.get('sni', url.hostname),
         'type': transport_type,
-        'path': params.get('path', [''])[0],
-        'host': params.get('host', [url.hostname])[0],
+        'path': params.get('path', ''),
+        'host': params.get('host', url.hostname),
         'security': security,
-        'alpn': params.get('alpn', [''])[0],
-        'fp': params.get('fp', [''])[0],
-        'pbk': params.get('pbk', [''])[0],
-        'sid': params.get('sid', [''])[0],
-        'spx': params.get('spx', [''])[0],
-        'name': unquote(url.fragment) if url.fragment else ''
+        'alpn': params.get('alpn', ''),
+        'fp': params.get('fp', ''),
+        'pbk': params.get('pbk', ''),
+        'sid': params.get('sid', ''),
+        'spx': params.get('spx', ''),
+        'name': url.fragment
     }
 
+@cached_parse
 def parse_trojan(config: str) -> Optional[Dict]:
     if not config or not isinstance(config, str) or not config.startswith('trojan://'):
         return None
     
     try:
-        url = urlparse(config)
+        url = split_uri(config)
     except Exception:
         return None
     
-    if not url.hostname or not url.username:
+    if not url or not url.hostname or not url.username:
         return None
     
     port = url.port or 443
     
-    params = parse_qs(url.query)
-    transport_type = params.get('type', ['tcp'])[0].lower()
+    params = url.params
+    transport_type = params.get('type', 'tcp').lower()
     if transport_type not in VALID_TRANSPORT_TYPES:
         transport_type = 'tcp'
     
@@ -156,33 +290,34 @@ def parse_trojan(config: str) -> Optional[Dict]:
         'password': url.username,
         'address': url.hostname,
         'port': port,
-        'sni': params.get('sni', [url.hostname])[0],
-        'alpn': params.get('alpn', [''])[0],
+        'sni': params.get('sni', url.hostname),
+        'alpn': params.get('alpn', ''),
         'type': transport_type,
-        'path': params.get('path', [''])[0],
-        'host': params.get('host', [url.hostname])[0],
-        'security': params.get('security', ['tls'])[0],
-        'fp': params.get('fp', [''])[0],
-        'flow': params.get('flow', [''])[0],
-        'name': unquote(url.fragment) if url.fragment else ''
+        'path': params.get('path', ''),
+        'host': params.get('host', url.hostname),
+        'security': params.get('security', 'tls'),
+        'fp': params.get('fp', ''),
+        'flow': params.get('flow', ''),
+        'name': url.fragment
     }
 
+@cached_parse
 def parse_hysteria2(config: str) -> Optional[Dict]:
     if not config or not isinstance(config, str) or not config.startswith(('hysteria2://', 'hy2://')):
         return None
     
     try:
-        url = urlparse(config)
+        url = split_uri(config)
     except Exception:
         return None
     
-    if not url.hostname:
+    if not url or not url.hostname:
         return None
     
     port = url.port or 443
     
-    params = parse_qs(url.query)
-    password = url.username or params.get('password', [''])[0]
+    params = url.params
+    password = url.username or params.get('password', '')
     if not password:
         return None
     
@@ -190,14 +325,15 @@ def parse_hysteria2(config: str) -> Optional[Dict]:
         'address': url.hostname,
         'port': port,
         'password': password,
-        'sni': params.get('sni', [url.hostname])[0],
-        'obfs': params.get('obfs', [''])[0],
-        'obfs-password': params.get('obfs-password', [''])[0],
-        'insecure': params.get('insecure', ['0'])[0],
-        'pinSHA256': params.get('pinSHA256', [''])[0],
-        'name': unquote(url.fragment) if url.fragment else ''
+        'sni': params.get('sni', url.hostname),
+        'obfs': params.get('obfs', ''),
+        'obfs-password': params.get('obfs-password', ''),
+        'insecure': params.get('insecure', '0'),
+        'pinSHA256': params.get('pinSHA256', ''),
+        'name': url.fragment
     }
 
+@cached_parse
 def parse_shadowsocks(config: str) -> Optional[Dict]:
     if not config or not isinstance(config, str) or not config.startswith('ss://'):
         return None
@@ -229,8 +365,8 @@ def parse_shadowsocks(config: str) -> Optional[Dict]:
             
             credential_decoded = unquote(credential_part)
             
-            if is_base64(credential_decoded):
-                method_pass = safe_b64decode(credential_decoded)
+            if base64_codec.is_base64_token(credential_decoded):
+                method_pass = base64_codec.safe_decode(credential_decoded)
                 if not method_pass or ':' not in method_pass:
                     return None
                 method, password = method_pass.split(':', 1)
@@ -239,7 +375,7 @@ def parse_shadowsocks(config: str) -> Optional[Dict]:
                     return None
                 method, password = credential_decoded.split(':', 1)
         else:
-            full_decoded = safe_b64decode(url_part)
+            full_decoded = base64_codec.safe_decode(url_part)
             if not full_decoded:
                 return None
             
@@ -289,17 +425,17 @@ def parse_wireguard(config: str) -> Optional[Dict]:
         return None
     
     try:
-        url = urlparse(config)
+        url = split_uri(config)
     except Exception:
         return None
     
-    if not url.hostname:
+    if not url or not url.hostname:
         return None
     
     port = url.port or 51820
     
-    params = parse_qs(url.query)
-    private_key = url.username or params.get('privatekey', [''])[0]
+    params = url.params
+    private_key = url.username or params.get('privatekey', '')
     if not private_key:
         return None
     
@@ -307,25 +443,26 @@ def parse_wireguard(config: str) -> Optional[Dict]:
         'address': url.hostname,
         'port': port,
         'private_key': private_key,
-        'public_key': params.get('publickey', [''])[0],
-        'preshared_key': params.get('presharedkey', [''])[0],
-        'reserved': params.get('reserved', [''])[0],
-        'mtu': params.get('mtu', ['1420'])[0],
-        'local_address': params.get('address', [''])[0],
-        'peers': params.get('peer', []),
-        'name': unquote(url.fragment) if url.fragment else ''
+        'public_key': params.get('publickey', ''),
+        'preshared_key': params.get('presharedkey', ''),
+        'reserved': params.get('reserved', ''),
+        'mtu': params.get('mtu', '1420'),
+        'local_address': params.get('address', ''),
+        'peers': parse_qs(url.query).get('peer', []),
+        'name': url.fragment
     }
 
+@cached_parse
 def parse_tuic(config: str) -> Optional[Dict]:
     if not config or not isinstance(config, str) or not config.startswith('tuic://'):
         return None
     
     try:
-        url = urlparse(config)
+        url = split_uri(config)
     except Exception:
         return None
     
-    if not url.hostname:
+    if not url or not url.hostname:
         return None
     
     port = url.port or 443
@@ -338,18 +475,87 @@ def parse_tuic(config: str) -> Optional[Dict]:
     except ValueError:
         return None
     
-    params = parse_qs(url.query)
+    params = url.params
     
     return {
         'address': url.hostname,
         'port': port,
         'uuid': uuid,
         'password': password,
-        'congestion_control': params.get('congestion_control', ['bbr'])[0],
-        'udp_relay_mode': params.get('udp_relay_mode', ['native'])[0],
-        'alpn': params.get('alpn', ['h3'])[0],
-        'sni': params.get('sni', [url.hostname])[0],
-        'allow_insecure': params.get('allow_insecure', ['0'])[0],
-        'disable_sni': params.get('disable_sni', ['0'])[0],
-        'name': unquote(url.fragment) if url.fragment else ''
-    }
\ No newline at end of file
+        'congestion_control': params.get('congestion_control', 'bbr'),
+        'udp_relay_mode': params.get('udp_relay_mode', 'native'),
+        'alpn': params.get('alpn', 'h3'),
+        'sni': params.get('sni', url.hostname),
+        'allow_insecure': params.get('allow_insecure', '0'),
+        'disable_sni': params.get('disable_sni', '0'),
+        'name': url.fragment
+    }
+
+PARSERS = {
+    'vmess': decode_vmess,
+    'vless': parse_vless,
+    'trojan': parse_trojan,
+    'hysteria2': parse_hysteria2,
+    'hy2': parse_hysteria2,
+    'ss': parse_shadowsocks,
+    'tuic': parse_tuic,
+    'wireguard': parse_wireguard
+}
+
+def parse_config(config: str) -> Optional[Tuple[str, Dict]]:
+    if not config or not isinstance(config, str):
+        return None
+    
+    scheme = config.split('://', 1)[0].lower()
+    parse = PARSERS.get(scheme)
+    if not parse:
+        return None
+    
+    try:
+        data = parse(config)
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not data:
+        return None
+    return ('hysteria2' if scheme == 'hy2' else scheme), data
+
+def key_parts(protocol: str, data: Dict) -> Optional[List]:
+    try:
+        if protocol == 'vmess':
+            parts = ['vmess', data['add'], data['port'], data['id'], data.get('scy', 'auto'), data['net'],
+                     data['tls'], data.get('type', ''), data.get('path', ''), data.get('host', ''), data.get('sni', '')]
+        elif protocol == 'vless':
+            parts = ['vless', data['address'], data['port'], data['uuid'], data['type'], data['security'],
+                     data['flow'], data['path'], data['host'], data['sni'], data['pbk'], data['sid']]
+        elif protocol == 'trojan':
+            parts = ['trojan', data['address'], data['port'], data['password'], data['type'], data['security'],
+                     data['path'], data['host'], data['sni']]
+        elif protocol == 'hysteria2':
+            parts = ['hysteria2', data['address'], data['port'], data['password'], data['sni'],
+                     data['obfs'], data['obfs-password']]
+        elif protocol == 'ss':
+            parts = ['ss', data['address'], data['port'], data['method'], data['password']]
+        elif protocol == 'tuic':
+            parts = ['tuic', data['address'], data['port'], data['uuid'], data['password'], data['sni']]
+        elif protocol == 'wireguard':
+            parts = ['wireguard', data['address'], data['port'], data['private_key'], data['public_key']]
+        else:
+            return None
+    except (KeyError, TypeError):
+        return None
+    
+    parts[1] = str(parts[1]).strip('[]').lower()
+    return parts
+
+def data_key(protocol: str, data: Dict) -> Optional[str]:
+    parts = key_parts(protocol, data)
+    return '|'.join(str(part) for part in parts) if parts else None
+
+def canonical_key(config: str) -> Optional[str]:
+    parsed = parse_config(config)
+    if not parsed:
+        return None
+    return data_key(*parsed)
+
+if ENABLE_PARSE_CACHE:
+    enable_parse_cache()
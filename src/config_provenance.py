@@ -0,0 +1,96 @@
+import os
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from proxy_endpoint import canonical_key
+
+logger = logging.getLogger(__name__)
+
+TEST_STAGES = ['xray', 'singbox']
+
+def provenance_key(config: str) -> str:
+    return canonical_key(config) or config.split('#', 1)[0].strip()
+
+def endpoint_key(host, port) -> str:
+    return f"{str(host).strip('[]').lower()}|{port}"
+
+def config_endpoint_key(config: str) -> Optional[str]:
+    parts = provenance_key(config).split('|', 3)
+    if len(parts) < 3:
+        return None
+    return endpoint_key(parts[1], parts[2])
+
+def outbound_endpoint_key(outbound: Dict) -> str:
+    return endpoint_key(outbound.get('server', ''), outbound.get('server_port', ''))
+
+class ConfigProvenance:
+    def __init__(self, state_file: str):
+        self.state_file = state_file
+        self.endpoints: Dict[str, str] = {}
+        self.tests: Dict[str, Dict[str, List[str]]] = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.endpoints = data.get('endpoints', {})
+            self.tests = {
+                stage: results for stage, results in data.get('tests', {}).items()
+                if isinstance(results, dict) and isinstance(results.get('tested'), list)
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Error loading config sources, starting empty: {str(e)}")
+
+    def save(self):
+        try:
+            data = {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'endpoints': self.endpoints,
+                'tests': self.tests
+            }
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"Error saving config sources: {str(e)}")
+
+    def record_sources(self, config_sources: Dict[str, str]):
+        self.endpoints = {}
+        self.tests = {}
+
+        for config, url in config_sources.items():
+            endpoint = config_endpoint_key(config)
+            if endpoint:
+                self.endpoints.setdefault(endpoint, url)
+
+        self.save()
+        logger.info(f"Recorded sources of {len(self.endpoints)} endpoints in {self.state_file}")
+
+    def record_test_results(self, stage: str, tested: Iterable[Optional[str]], working: Iterable[Optional[str]]):
+        tested_keys = sorted({key for key in tested if key in self.endpoints})
+        working_keys = sorted({key for key in working if key in self.endpoints})
+
+        self.tests[stage] = {'tested': tested_keys, 'working': working_keys}
+        self.save()
+        logger.info(f"Recorded {stage} test results for {len(tested_keys)} endpoints")
+
+    def channel_yields(self) -> Dict[str, Tuple[int, int]]:
+        stages = [
+            (set(self.tests[stage]['tested']), set(self.tests[stage].get('working', [])))
+            for stage in TEST_STAGES if stage in self.tests
+        ]
+        yields: Dict[str, List[int]] = {}
+        for key in set().union(*(tested for tested, _ in stages)):
+            url = self.endpoints.get(key)
+            if not url:
+                continue
+            counts = yields.setdefault(url, [0, 0])
+            counts[0] += 1
+            if all(key in working for tested, working in stages if key in tested):
+                counts[1] += 1
+
+        return {url: (tested, working) for url, (tested, working) in yields.items()}
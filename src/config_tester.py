@@ -12,6 +12,7 @@ import socket
 import sys
 from contextlib import closing, contextmanager
 from config import ProxyConfig
+from config_provenance import ConfigProvenance, outbound_endpoint_key
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -329,6 +330,13 @@ def main():
     tester = ParallelConfigTester(max_workers=max_workers, timeout=timeout, test_urls=test_urls)
     working = tester.test_all(proxy_outbounds)
     
+    provenance = ConfigProvenance(config_settings.PROVENANCE_FILE)
+    provenance.record_test_results(
+        'singbox',
+        (outbound_endpoint_key(outbound) for outbound in proxy_outbounds),
+        (outbound_endpoint_key(outbound) for outbound in working)
+    )
+    
     if working:
         config = update_config_with_working_outbounds(config, working)
         
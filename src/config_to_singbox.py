@@ -3,10 +3,8 @@ import base64
 import sys
 import os
 from typing import Dict, Optional
-from urllib.parse import urlparse, parse_qs
 import logging
-import config_parser as parser
-import transport_builder
+from proxy_endpoint import parse_endpoint
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -17,61 +15,11 @@ class ConfigToSingbox:
 
     def convert_to_singbox(self, config: str, index: int, protocol_type: str) -> Optional[Dict]:
         try:
-            config_lower = config.lower()
-            data = None
-            outbound = {}
-            
-            if config_lower.startswith('vmess://'):
-                data = parser.decode_vmess(config)
-                if not data: return None
-                tag = data.get('name') or f"{protocol_type} {index} - {data['add']}:{data['port']}"
-                transport, tls = transport_builder.build_singbox_settings(data)
-                outbound = {
-                    "type": "vmess", "tag": tag, "server": data['add'], "server_port": int(data['port']),
-                    "uuid": data['id'], "security": data.get('scy', 'auto'), "alter_id": int(data.get('aid', 0)),
-                    "transport": transport, "tls": tls
-                }
-            
-            elif config_lower.startswith('vless://'):
-                data = parser.parse_vless(config)
-                if not data: return None
-                tag = data.get('name') or f"{protocol_type} {index} - {data['address']}:{data['port']}"
-                transport, tls = transport_builder.build_singbox_settings(data)
-                outbound = {
-                    "type": "vless", "tag": tag, "server": data['address'], "server_port": data['port'],
-                    "uuid": data['uuid'], "flow": data.get('flow', ''), "tls": tls, "transport": transport
-                }
-            
-            elif config_lower.startswith('trojan://'):
-                data = parser.parse_trojan(config)
-                if not data: return None
-                tag = data.get('name') or f"{protocol_type} {index} - {data['address']}:{data['port']}"
-                transport, tls = transport_builder.build_singbox_settings(data)
-                outbound = {
-                    "type": "trojan", "tag": tag, "server": data['address'], "server_port": data['port'],
-                    "password": data['password'], "tls": tls, "transport": transport
-                }
-            
-            elif config_lower.startswith(('hysteria2://', 'hy2://')):
-                data = parser.parse_hysteria2(config)
-                if not data: return None
-                tag = data.get('name') or f"{protocol_type} {index} - {data['address']}:{data['port']}"
-                transport, tls = transport_builder.build_singbox_settings(data)
-                outbound = {
-                    "type": "hysteria2", "tag": tag, "server": data['address'], "server_port": data['port'],
-                    "password": data['password'], "tls": tls
-                }
-         
-            elif config_lower.startswith('ss://'):
-                data = parser.parse_shadowsocks(config)
-                if not data: return None
-                tag = data.get('name') or f"{protocol_type} {index} - {data['address']}:{data['port']}"
-                outbound = {
-                    "type": "shadowsocks", "tag": tag, "server": data['address'], "server_port": data['port'],
-                    "method": data['method'], "password": data['password']
-                }
-            
-            return outbound if outbound else None
+            endpoint = parse_endpoint(config)
+            if not endpoint:
+                return None
+            tag = endpoint.name or f"{protocol_type} {index} - {endpoint.address}:{endpoint.port}"
+            return endpoint.to_singbox_outbound(tag)
             
         except Exception as e:
             logger.error(f"Failed during convert_to_singbox for config {config[:30]}...: {e}")
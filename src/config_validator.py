@@ -1,46 +1,37 @@
 import re
-import base64
 import json
-from typing import Optional, Tuple, List
-from urllib.parse import unquote, urlparse
+from typing import Any, Dict, Optional, Tuple, List, Iterable, Iterator, Set
+from urllib.parse import unquote
+import base64_codec
+from config_parser import split_netloc
 
-class ConfigValidator:
-    @staticmethod
-    def is_base64(s: str) -> bool:
-        try:
-            s = s.rstrip('=')
-            return bool(re.match(r'^[A-Za-z0-9+/\-_]*$', s))
-        except:
-            return False
+CONFIG_PROTOCOLS = ['vmess://', 'vless://', 'ss://', 'trojan://', 'hysteria2://', 'hy2://', 'wireguard://', 'tuic://', 'ssconf://']
+CONFIG_PREFIXES = tuple(CONFIG_PROTOCOLS)
+PROTOCOL_PATTERN = re.compile('|'.join(re.escape(protocol) for protocol in CONFIG_PROTOCOLS))
+VALIDATED_PROTOCOLS = frozenset(protocol for protocol in CONFIG_PROTOCOLS if protocol != 'hy2://')
+BASE64_PROTOCOLS = ('vless://', 'ss://')
+NETLOC_PROTOCOLS = ('trojan://', 'hysteria2://', 'hy2://', 'wireguard://')
+VMESS_JUNK_PATTERN = re.compile(r'[^A-Za-z0-9+/=_-]')
+STRIPPED_CHARS_PATTERN = re.compile(r'[\U0001F300-\U0001F9FF\x00-\x08\x0B-\x1F\x7F-\x9F]')
+SPACE_RUN_PATTERN = re.compile(r'[^\S\r\n]+')
 
-    @staticmethod
-    def decode_base64_url(s: str) -> Optional[bytes]:
-        try:
-            s = s.replace('-', '+').replace('_', '/')
-            padding = 4 - (len(s) % 4)
-            if padding != 4:
-                s += '=' * padding
-            return base64.b64decode(s)
-        except:
-            return None
+class ValidatedConfig:
+    __slots__ = ('config', 'protocol', 'payload')
 
-    @staticmethod
-    def decode_base64_text(text: str) -> Optional[str]:
-        try:
-            if ConfigValidator.is_base64(text):
-                decoded = ConfigValidator.decode_base64_url(text)
-                if decoded:
-                    return decoded.decode('utf-8')
-            return None
-        except:
-            return None
+    def __init__(self, config: str, protocol: str, payload: Any = None):
+        self.config = config
+        self.protocol = protocol
+        self.payload = payload
 
+    def __repr__(self) -> str:
+        return f"ValidatedConfig({self.protocol}, {self.config[:40]!r})"
+
+class ConfigValidator:
     @staticmethod
     def clean_vmess_config(config: str) -> str:
         if "vmess://" in config:
-            base64_part = config[8:]
-            base64_clean = re.split(r'[^A-Za-z0-9+/=_-]', base64_part)[0]
-            return f"vmess://{base64_clean}"
+            junk = VMESS_JUNK_PATTERN.search(config, 8)
+            return f"vmess://{config[8:junk.start()] if junk else config[8:]}"
         return config
 
     @staticmethod
@@ -51,27 +42,11 @@ class ConfigValidator:
 
     @staticmethod
     def is_vmess_config(config: str) -> bool:
-        try:
-            if not config.startswith('vmess://'):
-                return False
-            base64_part = config[8:]
-            decoded = ConfigValidator.decode_base64_url(base64_part)
-            if decoded:
-                json.loads(decoded)
-                return True
-            return False
-        except:
-            return False
+        return ConfigValidator.check_config(config, 'vmess://') is not None
 
     @staticmethod
     def is_tuic_config(config: str) -> bool:
-        try:
-            if config.startswith('tuic://'):
-                parsed = urlparse(config)
-                return bool(parsed.netloc and ':' in parsed.netloc)
-            return False
-        except:
-            return False
+        return ConfigValidator.check_config(config, 'tuic://') is not None
 
     @staticmethod
     def convert_ssconf_to_https(url: str) -> str:
@@ -86,18 +61,16 @@ class ConfigValidator:
             if config.startswith(protocol):
                 base64_part = config[len(protocol):]
                 decoded_url = unquote(base64_part)
-                if (ConfigValidator.is_base64(decoded_url) or 
-                    ConfigValidator.is_base64(base64_part)):
+                if base64_codec.is_base64(decoded_url) or base64_codec.is_base64(base64_part):
                     return True, protocol[:-3]
         return False, ''
 
     @staticmethod
     def check_base64_content(text: str) -> Optional[str]:
         try:
-            decoded_text = ConfigValidator.decode_base64_text(text)
+            decoded_text = base64_codec.decode_text(text)
             if decoded_text:
-                protocols = ['vmess://', 'vless://', 'ss://', 'trojan://', 'hysteria2://', 'hy2://', 'wireguard://', 'tuic://', 'ssconf://']
-                for protocol in protocols:
+                for protocol in CONFIG_PROTOCOLS:
                     if protocol in decoded_text:
                         return decoded_text
             return None
@@ -107,76 +80,54 @@ class ConfigValidator:
     @staticmethod
     def _split_text_by_protocol(text: str) -> List[str]:
         configs = []
-        protocols = ['vmess://', 'vless://', 'ss://', 'trojan://', 'hysteria2://', 'hy2://', 'wireguard://', 'tuic://', 'ssconf://']
-        current_pos = 0
-        text_length = len(text)
+        boundaries = [(match.start(), match.group()) for match in PROTOCOL_PATTERN.finditer(text)]
+        boundaries.append((len(text), None))
         
-        while current_pos < text_length:
-            next_config_start = text_length
-            matching_protocol = None
-            
-            for protocol in protocols:
-                protocol_pos = text.find(protocol, current_pos)
-                if protocol_pos != -1 and protocol_pos < next_config_start:
-                    next_config_start = protocol_pos
-                    matching_protocol = protocol
+        for (config_start, matching_protocol), (config_end, _) in zip(boundaries, boundaries[1:]):
+            current_config = text[config_start:config_end].strip()
+            if matching_protocol == "vmess://":
+                current_config = ConfigValidator.clean_vmess_config(current_config)
+            elif matching_protocol == "hy2://":
+                current_config = ConfigValidator.normalize_hysteria2_protocol(current_config)
             
-            if matching_protocol:
-                current_pos = next_config_start
-                next_protocol_pos = text_length
-                
-                for protocol in protocols:
-                    pos = text.find(protocol, next_config_start + len(matching_protocol))
-                    if pos != -1 and pos < next_protocol_pos:
-                        next_protocol_pos = pos
-                
-                current_config = text[next_config_start:next_protocol_pos].strip()
-                if matching_protocol == "vmess://":
-                    current_config = ConfigValidator.clean_vmess_config(current_config)
-                elif matching_protocol == "hy2://":
-                    current_config = ConfigValidator.normalize_hysteria2_protocol(current_config)
-                
-                if ConfigValidator.is_valid_config(current_config):
-                    configs.append(current_config)
-                
-                current_pos = next_protocol_pos
-            else:
-                break
+            if ConfigValidator.is_valid_config(current_config):
+                configs.append(current_config)
         return configs
 
     @staticmethod
-    def split_configs(text: str) -> List[str]:
-        final_configs = []
-        lines = text.split('\n')
+    def _split_line(line: str) -> List[str]:
+        line = line.strip()
+        if not line:
+            return []
+            
+        decoded_content = ConfigValidator.check_base64_content(line)
+        if decoded_content:
+            return ConfigValidator._split_text_by_protocol(decoded_content)
+        return ConfigValidator._split_text_by_protocol(line)
+
+    @staticmethod
+    def iter_split_configs(lines: Iterable[str], seen: Optional[Set[str]] = None) -> Iterator[str]:
+        if seen is None:
+            seen = set()
         
         for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            if ConfigValidator.is_base64(line):
-                decoded_content = ConfigValidator.check_base64_content(line)
-                if decoded_content:
-                    final_configs.extend(ConfigValidator._split_text_by_protocol(decoded_content))
-                else:
-                    final_configs.extend(ConfigValidator._split_text_by_protocol(line))
-            else:
-                final_configs.extend(ConfigValidator._split_text_by_protocol(line))
-        
-        seen = set()
-        unique_configs = []
-        for config in final_configs:
-            if config not in seen:
-                seen.add(config)
-                unique_configs.append(config)
-        
-        return unique_configs
+            for config in ConfigValidator._split_line(line):
+                if config not in seen:
+                    seen.add(config)
+                    yield config
+
+    @staticmethod
+    def split_configs(text: str) -> List[str]:
+        return list(ConfigValidator.iter_split_configs(text.split('\n')))
 
     @staticmethod
     def clean_config(config: str) -> str:
-        config = re.sub(r'[\U0001F300-\U0001F9FF]', '', config)
-        config = re.sub(r'[\x00-\x08\x0B-\x1F\x7F-\x9F]', '', config)
-        config = re.sub(r'[^\S\r\n]+', ' ', config)
+        if config.isascii() and config.isprintable():
+            if '  ' in config:
+                config = SPACE_RUN_PATTERN.sub(' ', config)
+            return config.strip()
+        config = STRIPPED_CHARS_PATTERN.sub('', config)
+        config = SPACE_RUN_PATTERN.sub(' ', config)
         config = config.strip()
         return config
 
@@ -185,28 +136,58 @@ class ConfigValidator:
         if not config:
             return False
             
-        protocols = ['vmess://', 'vless://', 'ss://', 'trojan://', 'hysteria2://', 'hy2://', 'wireguard://', 'tuic://', 'ssconf://']
-        return any(config.startswith(p) for p in protocols)
+        return config.startswith(CONFIG_PREFIXES)
 
-    @classmethod
-    def validate_protocol_config(cls, config: str, protocol: str) -> bool:
+    @staticmethod
+    def check_config(config: str, protocol: str) -> Optional[ValidatedConfig]:
         try:
-            if protocol in ['vmess://', 'vless://', 'ss://', 'tuic://']:
-                if protocol == 'vmess://':
-                    return cls.is_vmess_config(config)
-                if protocol == 'tuic://':
-                    return cls.is_tuic_config(config)
+            if protocol == 'vmess://':
+                decoded = base64_codec.decode(config[8:]) if config.startswith('vmess://') else None
+                if decoded:
+                    return ValidatedConfig(config, protocol, json.loads(decoded))
+            elif protocol == 'tuic://':
+                split = split_netloc(config) if config.startswith('tuic://') else None
+                if split and ':' in split[0]:
+                    return ValidatedConfig(config, protocol)
+            elif protocol in BASE64_PROTOCOLS:
                 base64_part = config[len(protocol):]
-                decoded_url = unquote(base64_part)
-                if cls.is_base64(decoded_url) or cls.is_base64(base64_part):
-                    return True
-                if cls.decode_base64_url(base64_part) or cls.decode_base64_url(decoded_url):
-                    return True
-            elif protocol in ['trojan://', 'hysteria2://', 'hy2://', 'wireguard://']:
-                parsed = urlparse(config)
-                return bool(parsed.netloc and '@' in parsed.netloc)
+                candidates = [base64_part, unquote(base64_part)] if '%' in base64_part else [base64_part]
+                for candidate in candidates:
+                    if base64_codec.is_base64(candidate):
+                        return ValidatedConfig(config, protocol, base64_codec.decode(candidate))
+                for candidate in candidates:
+                    decoded = base64_codec.decode_uncached(candidate)
+                    if decoded:
+                        return ValidatedConfig(config, protocol, decoded)
+            elif protocol in NETLOC_PROTOCOLS:
+                split = split_netloc(config)
+                if split and '@' in split[0]:
+                    return ValidatedConfig(config, protocol)
             elif protocol == 'ssconf://':
-                return True
-            return False
-        except:
-            return False
\ No newline at end of file
+                return ValidatedConfig(config, protocol)
+        except (ValueError, RecursionError):
+            pass
+        return None
+
+    @staticmethod
+    def validate_protocol_config(config: str, protocol: str) -> bool:
+        return ConfigValidator.check_config(config, protocol) is not None
+
+    @staticmethod
+    def validate(config: str) -> Optional[ValidatedConfig]:
+        config = ConfigValidator.normalize_hysteria2_protocol(config)
+        protocol = config[:config.find('://') + 3]
+        if protocol not in VALIDATED_PROTOCOLS:
+            return None
+        if protocol == 'vmess://':
+            config = ConfigValidator.clean_vmess_config(config)
+        return ConfigValidator.check_config(ConfigValidator.clean_config(config), protocol)
+
+    @staticmethod
+    def validate_many(configs: Iterable[str]) -> List[Optional[ValidatedConfig]]:
+        configs = list(configs)
+        results: Dict[str, Optional[ValidatedConfig]] = {}
+        for config in configs:
+            if config not in results:
+                results[config] = ConfigValidator.validate(config)
+        return [results[config] for config in configs]
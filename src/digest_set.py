@@ -0,0 +1,135 @@
+import mmap
+import heapq
+import hashlib
+import tempfile
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, Optional, Set
+
+def config_digest(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+
+class DigestSet:
+    def __init__(self, spill_to_disk: bool = False, buffer_size: int = 16384):
+        self.spill_to_disk = spill_to_disk
+        self.buffer_size = max(1, buffer_size)
+        self.pending: Set[int] = set()
+        self.digests = array('Q')
+        self.spill_file = None
+        self.spill_map = None
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains_digest(config_digest(key))
+
+    def contains_digest(self, digest: int) -> bool:
+        if digest in self.pending:
+            return True
+        index = bisect_left(self.digests, digest)
+        return index < len(self.digests) and self.digests[index] == digest
+
+    def __iter__(self) -> Iterator[int]:
+        self.flush()
+        return iter(self.digests)
+
+    def add(self, key: str) -> bool:
+        return self.add_digest(config_digest(key))
+
+    def add_digest(self, digest: int) -> bool:
+        if self.contains_digest(digest):
+            return False
+
+        self.pending.add(digest)
+        self.count += 1
+        if len(self.pending) >= max(self.buffer_size, len(self.digests) // 4):
+            self.flush()
+        return True
+
+    def update(self, keys: Iterable[str]):
+        for key in keys:
+            self.add(key)
+
+    def flush(self):
+        if not self.pending:
+            return
+
+        if self.spill_to_disk:
+            self.spill(heapq.merge(self.digests, sorted(self.pending)))
+        else:
+            self.digests = array('Q', sorted(self.digests + array('Q', self.pending)))
+        self.pending = set()
+
+    def spill(self, merged: Iterator[int]):
+        spill_file = tempfile.TemporaryFile(prefix='dedupe-')
+        chunk = array('Q')
+        for digest in merged:
+            chunk.append(digest)
+            if len(chunk) >= self.buffer_size:
+                chunk.tofile(spill_file)
+                chunk = array('Q')
+        chunk.tofile(spill_file)
+        spill_file.flush()
+
+        self.close()
+        self.spill_file = spill_file
+        self.spill_map = mmap.mmap(spill_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.digests = memoryview(self.spill_map).cast('Q')
+
+    def close(self):
+        if isinstance(self.digests, memoryview):
+            self.digests.release()
+        self.digests = array('Q')
+        if self.spill_map:
+            self.spill_map.close()
+            self.spill_map = None
+        if self.spill_file:
+            self.spill_file.close()
+            self.spill_file = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+class DigestMap:
+    def __init__(self, buffer_size: int = 16384):
+        self.buffer_size = max(1, buffer_size)
+        self.pending: Dict[int, int] = {}
+        self.digests = array('Q')
+        self.values = array('Q')
+
+    def __len__(self) -> int:
+        return len(self.digests) + len(self.pending)
+
+    def get(self, digest: int, default: Optional[int] = None) -> Optional[int]:
+        if digest in self.pending:
+            return self.pending[digest]
+        index = bisect_left(self.digests, digest)
+        if index < len(self.digests) and self.digests[index] == digest:
+            return self.values[index]
+        return default
+
+    def put(self, digest: int, value: int):
+        index = bisect_left(self.digests, digest)
+        if index < len(self.digests) and self.digests[index] == digest:
+            self.values[index] = value
+            return
+
+        self.pending[digest] = value
+        if len(self.pending) >= max(self.buffer_size, len(self.digests) // 4):
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+
+        digests, values = array('Q'), array('Q')
+        for digest, value in heapq.merge(zip(self.digests, self.values), sorted(self.pending.items())):
+            digests.append(digest)
+            values.append(value)
+        self.digests, self.values = digests, values
+        self.pending = {}
@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import signal
+import socket
+import logging
+import tempfile
+import threading
+import subprocess
+from collections import deque
+from contextlib import closing
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROXY_SCHEMES = ('http://', 'https://', 'socks5://', 'socks5h://')
+
+def load_candidates(path: str) -> List[str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith('//')]
+    except FileNotFoundError:
+        logger.warning(f"No tested configs found at {path}")
+        return []
+    except Exception as e:
+        logger.error(f"Error reading tested configs from {path}: {str(e)}")
+        return []
+
+def wait_for_port(port: int, process: subprocess.Popen, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as s:
+            s.settimeout(0.2)
+            if s.connect_ex(('127.0.0.1', port)) == 0:
+                return True
+        time.sleep(0.1)
+    return False
+
+class Egress:
+    def __init__(self, label: str, proxy_url: str, process: Optional[subprocess.Popen] = None,
+                 config_file: Optional[str] = None):
+        self.label = label
+        self.proxy_url = proxy_url
+        self.process = process
+        self.config_file = config_file
+        self.failures = 0
+        self.requests = 0
+
+    @property
+    def proxies(self) -> Dict[str, str]:
+        return {'http': self.proxy_url, 'https': self.proxy_url}
+
+    def is_alive(self) -> bool:
+        return self.process is None or self.process.poll() is None
+
+    def stop(self):
+        if self.process:
+            try:
+                if self.process.poll() is None:
+                    os.killpg(os.getpgid(self.process.pid), signal.SIGTERM)
+                    try:
+                        self.process.wait(timeout=2)
+                    except subprocess.TimeoutExpired:
+                        os.killpg(os.getpgid(self.process.pid), signal.SIGKILL)
+                        self.process.wait(timeout=1)
+            except (ProcessLookupError, OSError) as e:
+                logger.debug(f"Process cleanup error (ignorable): {e}")
+            self.process = None
+        if self.config_file and os.path.exists(self.config_file):
+            try:
+                os.unlink(self.config_file)
+            except OSError as e:
+                logger.debug(f"Failed to remove temp file {self.config_file}: {e}")
+        self.config_file = None
+
+class EgressPool:
+    def __init__(self, candidates: List[str], size: int, failure_threshold: int = 2,
+                 xray_path: str = 'xray', startup_timeout: float = 5.0):
+        self.candidates = deque(candidates)
+        self.size = max(1, size)
+        self.failure_threshold = max(1, failure_threshold)
+        self.xray_path = xray_path
+        self.startup_timeout = startup_timeout
+        self.lock = threading.Lock()
+        self.egresses: List[Egress] = []
+        self.next_index = 0
+        self.rotated_out = 0
+        self.tester = None
+        self.fill()
+        logger.info(f"Started {len(self.egresses)} fetch proxies ({len(self.candidates)} spare candidates)")
+
+    def get_tester(self):
+        if self.tester is None:
+            from xray_config_tester import XrayTester
+            try:
+                self.tester = XrayTester(self.xray_path)
+            except RuntimeError as e:
+                logger.warning(f"Cannot start config proxies: {str(e)}")
+                self.tester = False
+        return self.tester
+
+    def start_egress(self, candidate: str) -> Optional[Egress]:
+        if candidate.lower().startswith(PROXY_SCHEMES):
+            return Egress(candidate, candidate)
+
+        tester = self.get_tester()
+        if not tester or not tester.is_supported_protocol(candidate):
+            return None
+        outbound = tester.parse_config_string(candidate)
+        if not outbound:
+            return None
+
+        from xray_config_tester import find_free_port
+        egress = None
+        try:
+            socks_port = find_free_port()
+            http_port = find_free_port()
+            fd, config_file = tempfile.mkstemp(suffix='.json', text=True, prefix='egress_')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(tester.create_xray_config(outbound, socks_port, http_port), f)
+
+            label = candidate.split('#', 1)[-1] if '#' in candidate else candidate.split('://', 1)[0]
+            egress = Egress(label, f"http://127.0.0.1:{http_port}", config_file=config_file)
+            egress.process = subprocess.Popen(
+                [self.xray_path, 'run', '-c', config_file],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                preexec_fn=os.setsid
+            )
+            if wait_for_port(http_port, egress.process, self.startup_timeout):
+                return egress
+            logger.debug(f"Proxy {label} did not start listening")
+        except Exception as e:
+            logger.debug(f"Failed to start proxy: {str(e)}")
+        if egress:
+            egress.stop()
+        return None
+
+    def fill(self):
+        while True:
+            with self.lock:
+                if len(self.egresses) >= self.size or not self.candidates:
+                    return
+                candidate = self.candidates.popleft()
+
+            egress = self.start_egress(candidate)
+            if not egress:
+                continue
+
+            with self.lock:
+                if len(self.egresses) < self.size:
+                    self.egresses.append(egress)
+                    logger.info(f"Fetch proxy {egress.label} listening on {egress.proxy_url}")
+                    continue
+            egress.stop()
+            return
+
+    def acquire(self) -> Optional[Egress]:
+        with self.lock:
+            dead = [egress for egress in self.egresses if not egress.is_alive()]
+        for egress in dead:
+            self.rotate_out(egress, "process exited")
+
+        with self.lock:
+            if not self.egresses:
+                return None
+            egress = self.egresses[self.next_index % len(self.egresses)]
+            self.next_index += 1
+            egress.requests += 1
+            return egress
+
+    def report_success(self, egress: Egress):
+        with self.lock:
+            egress.failures = 0
+
+    def report_failure(self, egress: Egress):
+        with self.lock:
+            egress.failures += 1
+            failing = egress.failures >= self.failure_threshold
+        if failing:
+            self.rotate_out(egress, f"{egress.failures} failures in a row")
+
+    def rotate_out(self, egress: Egress, reason: str):
+        with self.lock:
+            if egress not in self.egresses:
+                return
+            self.egresses.remove(egress)
+            self.rotated_out += 1
+        logger.warning(f"Rotating out fetch proxy {egress.label}: {reason}")
+        egress.stop()
+        self.fill()
+
+    def close(self):
+        with self.lock:
+            egresses, self.egresses = self.egresses, []
+        for egress in egresses:
+            egress.stop()
+        logger.info(f"Stopped {len(egresses)} fetch proxies ({self.rotated_out} rotated out during the run)")
@@ -7,10 +7,9 @@ import socket
 import requests
 import time
 from typing import Dict, Optional, Tuple, List
-from urllib.parse import urlparse, parse_qs
 from collections import OrderedDict
 from user_settings import LOCATION_APIS
-import config_parser as parser
+from proxy_endpoint import parse_endpoint, OUTBOUND_PROTOCOLS
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -270,29 +269,9 @@ class ConfigEnricher:
 
     def extract_address(self, config: str) -> Optional[str]:
         try:
-            config_lower = config.lower()
-            data = None
-            
-            if config_lower.startswith('vmess://'):
-                data = parser.decode_vmess(config)
-                if data and 'add' in data:
-                    return data['add']
-            
-            elif config_lower.startswith('vless://'):
-                data = parser.parse_vless(config)
-            
-            elif config_lower.startswith('trojan://'):
-                data = parser.parse_trojan(config)
-            
-            elif config_lower.startswith(('hysteria2://', 'hy2://')):
-                data = parser.parse_hysteria2(config)
-            
-            elif config_lower.startswith('ss://'):
-                data = parser.parse_shadowsocks(config)
-            
-            if data and 'address' in data:
-                return data['address']
-            
+            endpoint = parse_endpoint(config)
+            if endpoint and endpoint.protocol in OUTBOUND_PROTOCOLS:
+                return endpoint.address
             return None
         except Exception as e:
             logger.debug(f"Failed to extract address from config: {e}")
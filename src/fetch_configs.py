@@ -2,13 +2,35 @@ import re
 import os
 import time
 import json
+import heapq
+import mmap
+import random
+import codecs
+import hashlib
+import itertools
 import logging
+import tempfile
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FuturesTimeoutError, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional, Set
+from typing import Callable, List, Dict, Optional, Set, Tuple, Iterable, Iterator, Union
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+from email.utils import parsedate_to_datetime
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from config import ProxyConfig, ChannelConfig
-from config_validator import ConfigValidator
+from config_validator import ConfigValidator, ValidatedConfig
+import base64_codec
+from source_cache import SourceCache
+from circuit_breaker import HostCircuitBreaker
+from digest_set import DigestMap, DigestSet, config_digest
+from config_provenance import ConfigProvenance
+from proxy_endpoint import canonical_key
+import config_parser as parser
+from egress_pool import EgressPool, load_candidates
+from telegram_parser import extract_telegram_messages, TelegramMessage
 
 logging.basicConfig(
     level=logging.INFO,
@@ -20,15 +42,125 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class HostRateLimiter:
+    def __init__(self, max_per_host: int, min_interval: float):
+        self.max_per_host = max(1, max_per_host)
+        self.min_interval = max(0.0, min_interval)
+        self.lock = threading.Lock()
+        self.semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self.next_request_time: Dict[str, float] = {}
+
+    def acquire(self, url: str) -> Callable[[], None]:
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            semaphore = self.semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self.semaphores[host] = semaphore
+        
+        semaphore.acquire()
+        released = threading.Event()
+        
+        def release():
+            with self.lock:
+                if released.is_set():
+                    return
+                released.set()
+            semaphore.release()
+        
+        with self.lock:
+            now = time.monotonic()
+            start_time = max(now, self.next_request_time.get(host, 0.0))
+            self.next_request_time[host] = start_time + self.min_interval
+        
+        if start_time > now:
+            time.sleep(start_time - now)
+        return release
+
+    @staticmethod
+    def hold_until_closed(response: requests.Response, release: Callable[[], None]):
+        close = response.close
+        
+        def close_and_release():
+            try:
+                close()
+            finally:
+                release()
+        
+        response.close = close_and_release
+        weakref.finalize(response, release)
+
+def hash_chunks(chunks: Iterable[bytes], hasher) -> Iterator[bytes]:
+    for chunk in chunks:
+        if chunk:
+            hasher.update(chunk)
+            yield chunk
+
+def iter_text_lines(chunks: Iterable[bytes], encoding: str) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    parts: List[str] = []
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if '\n' not in text:
+            parts.append(text)
+            continue
+        lines = text.split('\n')
+        parts.append(lines[0])
+        lines[0] = ''.join(parts)
+        parts = [lines.pop()]
+        yield from lines
+    parts.append(decoder.decode(b'', final=True))
+    pending = ''.join(parts)
+    if pending:
+        yield pending
+
+FETCH_PHASES = ('network', 'parse', 'base64', 'split', 'validation')
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+class FetchSkipped(Exception):
+    pass
+
 class ConfigFetcher:
     def __init__(self, config: ProxyConfig):
         self.config = config
         self.validator = ConfigValidator()
         self.protocol_counts: Dict[str, int] = {p: 0 for p in config.SUPPORTED_PROTOCOLS}
-        self.seen_configs: Set[str] = set()
+        self.seen_configs = DigestSet(spill_to_disk=config.DEDUPE_SPILL_TO_DISK) if config.ENABLE_COMPACT_DEDUPE else set()
         self.channel_protocol_counts: Dict[str, Dict[str, int]] = {}
+        self.config_sources: Dict[str, str] = {}
+        self.channel_keys: Dict[str, DigestSet] = {}
+        self.repost_levels: List[DigestSet] = []
+        self.config_ranks = DigestMap()
+        self.config_dates: Dict[str, Dict[str, datetime]] = {}
+        self.overlap_report: Optional[Dict] = None
         self.session = requests.Session()
         self.session.headers.update(config.HEADERS)
+        adapter = HTTPAdapter(pool_connections=config.FETCH_MAX_WORKERS, pool_maxsize=config.FETCH_MAX_WORKERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.host_limiter = HostRateLimiter(config.FETCH_PER_HOST_LIMIT, config.FETCH_PER_HOST_DELAY)
+        self.source_cache = SourceCache(config.SOURCE_CACHE_FILE) if config.ENABLE_SOURCE_CACHE else None
+        self.ssconf_executor = ThreadPoolExecutor(max_workers=config.SSCONF_MAX_WORKERS)
+        self.hedge_executor = ThreadPoolExecutor(max_workers=config.FETCH_MAX_WORKERS)
+        self.ssconf_futures: Dict[str, Future] = {}
+        self.ssconf_lock = threading.Lock()
+        self.circuit_breaker = HostCircuitBreaker(
+            config.CIRCUIT_BREAKER_FILE, config.CIRCUIT_BREAKER_THRESHOLD,
+            config.CIRCUIT_BREAKER_BASE_DELAY, config.CIRCUIT_BREAKER_MAX_DELAY
+        )
+        self.run_deadline = time.monotonic() + config.FETCH_RUN_BUDGET
+        self.egress_pool = self.create_egress_pool() if config.ENABLE_PROXY_FETCH else None
+
+    def create_egress_pool(self) -> EgressPool:
+        candidates = self.config.PROXY_FETCH_URLS + load_candidates(self.config.PROXY_FETCH_CONFIGS_FILE)
+        pool = EgressPool(
+            candidates, self.config.PROXY_FETCH_POOL_SIZE, self.config.PROXY_FETCH_FAILURE_THRESHOLD,
+            startup_timeout=self.config.PROXY_FETCH_STARTUP_TIMEOUT
+        )
+        if not pool.egresses:
+            logger.warning("No fetch proxy could be started, fetching sources directly")
+        return pool
 
     def extract_config(self, text: str, start_index: int, protocol: str) -> Optional[str]:
         try:
@@ -45,34 +177,164 @@ class ConfigFetcher:
             logger.error(f"Error in extract_config: {str(e)}")
             return None
 
-    def fetch_with_retry(self, url: str) -> Optional[requests.Response]:
-        backoff = 1
-        for attempt in range(self.config.MAX_RETRIES):
+    def fetch_with_retry(self, url: str, headers: Optional[Dict[str, str]] = None, stream: bool = False,
+                         max_retries: Optional[int] = None, timeout: Optional[float] = None) -> Optional[requests.Response]:
+        max_retries = max_retries or self.config.MAX_RETRIES
+        timeout = timeout or self.config.REQUEST_TIMEOUT
+        host = urlparse(url).netloc.lower()
+        
+        if not self.circuit_breaker.allow(host):
+            raise FetchSkipped(f"circuit open for {host}")
+        
+        deadline = min(time.monotonic() + self.config.FETCH_REQUEST_BUDGET, self.run_deadline)
+        error = "time budget exhausted"
+        attempts = 0
+        
+        for attempt in range(max_retries):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            attempts += 1
+            retry_after = None
+            egress = self.egress_pool.acquire() if self.egress_pool else None
             try:
-                response = self.session.get(url, timeout=self.config.REQUEST_TIMEOUT)
-                response.raise_for_status()
-                return response
-            except requests.RequestException as e:
-                if attempt == self.config.MAX_RETRIES - 1:
-                    logger.error(f"Failed to fetch {url} after {self.config.MAX_RETRIES} attempts: {str(e)}")
+                release = self.host_limiter.acquire(url)
+                try:
+                    response = self.session.get(url, headers=headers, stream=stream, timeout=min(timeout, remaining),
+                                                proxies=egress.proxies if egress else None)
+                except BaseException:
+                    release()
+                    raise
+                if stream:
+                    self.host_limiter.hold_until_closed(response, release)
+                else:
+                    release()
+                if egress:
+                    self.egress_pool.report_success(egress)
+                if response.ok:
+                    self.circuit_breaker.record_success(host)
+                    return response
+                
+                status_code = response.status_code
+                retry_after = self.parse_retry_after(response.headers.get('Retry-After'))
+                response.close()
+                
+                if status_code not in RETRYABLE_STATUS_CODES:
+                    self.circuit_breaker.record_success(host)
+                    logger.error(f"Failed to fetch {url}: HTTP {status_code}")
                     return None
-                wait_time = min(self.config.RETRY_DELAY * backoff, 60)
-                logger.warning(f"Attempt {attempt + 1} failed, retrying in {wait_time}s: {str(e)}")
-                time.sleep(wait_time)
-                backoff *= 2
+                error = f"HTTP {status_code}"
+            except requests.RequestException as e:
+                error = str(e)
+                if egress:
+                    self.egress_pool.report_failure(egress)
+                    error = f"{error} (via {egress.label})"
+                    if isinstance(e, requests.exceptions.ProxyError):
+                        retry_after = 0
+            
+            if attempt == max_retries - 1:
+                break
+            
+            wait_time = retry_after if retry_after is not None else self.backoff_delay(attempt)
+            if time.monotonic() + wait_time >= deadline:
+                logger.warning(f"Not retrying {url}: next attempt in {wait_time:.1f}s exceeds time budget")
+                break
+            
+            logger.warning(f"Attempt {attempt + 1} failed, retrying in {wait_time:.1f}s: {error}")
+            time.sleep(wait_time)
+        
+        if not attempts:
+            raise FetchSkipped(error)
+        
+        self.circuit_breaker.record_failure(host)
+        logger.error(f"Failed to fetch {url} after {attempts} attempts: {error}")
         return None
 
-    def fetch_ssconf_configs(self, url: str) -> List[str]:
+    def fetch_hedged(self, urls: List[str], headers: Optional[Dict[str, str]] = None,
+                     stream: bool = False) -> Tuple[Optional[requests.Response], Optional[str]]:
+        if len(urls) == 1:
+            return self.fetch_with_retry(urls[0], headers, stream=stream), urls[0]
+        
+        remaining = list(urls)
+        future_urls: Dict[Future, str] = {}
+        pending: Set[Future] = set()
+        winner: Tuple[Optional[requests.Response], Optional[str]] = (None, None)
+        skipped: List[str] = []
+        
+        try:
+            while (remaining or pending) and winner[0] is None:
+                if remaining:
+                    url = remaining.pop(0)
+                    future = self.hedge_executor.submit(self.fetch_with_retry, url, headers, stream)
+                    future_urls[future] = url
+                    pending.add(future)
+                
+                timeout = self.config.FETCH_HEDGE_DELAY if remaining else None
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    try:
+                        response = future.result()
+                    except FetchSkipped as e:
+                        skipped.append(str(e))
+                        continue
+                    except Exception as e:
+                        logger.error(f"Error fetching {future_urls[future]}: {str(e)}")
+                        continue
+                    if not response:
+                        continue
+                    if winner[0] is None:
+                        winner = (response, future_urls[future])
+                    else:
+                        response.close()
+        finally:
+            for future in pending:
+                future.add_done_callback(self.discard_response)
+        
+        if winner[0] is None and len(skipped) == len(urls):
+            raise FetchSkipped(skipped[0])
+        return winner
+
+    @staticmethod
+    def discard_response(future: Future):
+        if not future.cancelled() and future.exception() is None and future.result():
+            future.result().close()
+
+    def record_endpoint(self, channel: ChannelConfig, endpoint: Optional[str]):
+        if endpoint and endpoint != channel.preferred_url:
+            logger.info(f"{channel.url}: {endpoint} answered first and will be tried first next time")
+            channel.preferred_url = endpoint
+
+    def backoff_delay(self, attempt: int) -> float:
+        delay = min(self.config.RETRY_DELAY * (2 ** attempt), self.config.RETRY_MAX_DELAY)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_time = parsedate_to_datetime(value)
+            if retry_time.tzinfo is None:
+                retry_time = retry_time.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_time - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def fetch_ssconf_configs(self, url: str, max_retries: Optional[int] = None, timeout: Optional[float] = None) -> List[str]:
         https_url = self.validator.convert_ssconf_to_https(url)
         configs = []
         
-        response = self.fetch_with_retry(https_url)
+        response = self.fetch_with_retry(https_url, max_retries=max_retries, timeout=timeout)
         if response and response.text.strip():
             text = response.text.strip()
-            if self.validator.is_base64(text):
-                decoded = self.validator.decode_base64_text(text)
-                if decoded:
-                    text = decoded
+            decoded = base64_codec.decode_text(text)
+            if decoded:
+                text = decoded
             
             if text.startswith('ss://'):
                 configs.append(text)
@@ -81,104 +343,494 @@ class ConfigFetcher:
             
         return configs
 
-    def check_and_decode_base64(self, text: str) -> str:
-        if self.validator.is_base64(text):
-            decoded = self.validator.decode_base64_text(text)
-            if decoded:
-                return decoded
-        return text
+    def resolve_ssconf_links(self, links: Iterable[str]) -> Dict[str, Optional[List[str]]]:
+        futures: Dict[str, Future] = {}
+        with self.ssconf_lock:
+            for link in dict.fromkeys(links):
+                future = self.ssconf_futures.get(link)
+                if future is None:
+                    future = self.ssconf_executor.submit(
+                        self.fetch_ssconf_configs, link, self.config.SSCONF_MAX_RETRIES, self.config.SSCONF_TIMEOUT
+                    )
+                    self.ssconf_futures[link] = future
+                futures[link] = future
+            backlog = sum(1 for future in self.ssconf_futures.values() if not future.done())
+        
+        waves = -(-backlog // self.config.SSCONF_MAX_WORKERS)
+        deadline = time.monotonic() + self.config.SSCONF_DEADLINE * max(1, waves)
+        resolved: Dict[str, Optional[List[str]]] = {}
+        for link, future in futures.items():
+            try:
+                resolved[link] = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FuturesTimeoutError:
+                logger.warning(f"Timed out resolving {link}")
+                resolved[link] = None
+            except Exception as e:
+                logger.warning(f"Error resolving {link}: {str(e)}")
+                resolved[link] = None
+        return resolved
+
+    def decode_base64_parts(self, parts: List[str], channel: ChannelConfig) -> Iterator[str]:
+        started = time.perf_counter()
+        decoded_parts = base64_codec.decode_many(parts)
+        self.record_phase(channel, 'base64', started,
+                          sum(len(part) for part, decoded in zip(parts, decoded_parts) if decoded))
+        
+        for decoded_part in decoded_parts:
+            if decoded_part:
+                started = time.perf_counter()
+                found_configs = self.validator.split_configs(decoded_part)
+                self.record_phase(channel, 'split', started, len(decoded_part))
+                channel.metrics.total_configs += len(found_configs)
+                yield from found_configs
 
     def fetch_configs_from_source(self, channel: ChannelConfig) -> List[str]:
-        configs: List[str] = []
+        try:
+            configs, response_time = self.download_source(channel)
+        except FetchSkipped as e:
+            logger.warning(f"Skipped {channel.url}: {str(e)}")
+            self.discard_source_state(channel)
+            return self.reuse_cached_configs(channel)
+        self.commit_source_state(channel)
+        return self.process_source_configs(channel, configs, response_time)
+
+    def commit_source_state(self, channel: ChannelConfig):
+        if self.source_cache:
+            self.source_cache.commit(channel.url)
+
+    def discard_source_state(self, channel: ChannelConfig):
+        if self.source_cache:
+            self.source_cache.discard(channel.url)
+
+    def reset_run_metrics(self, channel: ChannelConfig):
         channel.metrics.total_configs = 0
         channel.metrics.valid_configs = 0
         channel.metrics.unique_configs = 0
         channel.metrics.protocol_counts = {p: 0 for p in self.config.SUPPORTED_PROTOCOLS}
+        channel.metrics.phase_times = {phase: 0.0 for phase in FETCH_PHASES}
+        channel.metrics.phase_bytes = {phase: 0 for phase in FETCH_PHASES}
+
+    @staticmethod
+    def record_phase(channel: ChannelConfig, phase: str, started: float, size: int = 0):
+        channel.metrics.phase_times[phase] = channel.metrics.phase_times.get(phase, 0.0) + time.perf_counter() - started
+        if size:
+            channel.metrics.phase_bytes[phase] = channel.metrics.phase_bytes.get(phase, 0) + size
+
+    def timed_chunks(self, chunks: Iterable[bytes], channel: ChannelConfig) -> Iterator[bytes]:
+        iterator = iter(chunks)
+        while True:
+            started = time.perf_counter()
+            chunk = next(iterator, None)
+            if chunk is None:
+                self.record_phase(channel, 'network', started)
+                return
+            self.record_phase(channel, 'network', started, len(chunk))
+            yield chunk
+
+    def download_source(self, channel: ChannelConfig) -> Tuple[Optional[List[str]], float]:
+        configs: List[str] = []
+        self.reset_run_metrics(channel)
         
         start_time = time.time()
         
         if channel.url.startswith('ssconf://'):
+            started = time.perf_counter()
             configs.extend(self.fetch_ssconf_configs(channel.url))
-            if configs:
-                response_time = time.time() - start_time
-                self.config.update_channel_stats(channel, True, response_time)
-            return configs
+            self.record_phase(channel, 'network', started)
+            return configs, time.time() - start_time
+        
+        if channel.is_telegram:
+            return self.fetch_telegram_configs(channel)
+        
+        if channel.is_local:
+            return self.read_local_source(channel)
 
-        response = self.fetch_with_retry(channel.url)
+        cached = self.source_cache.get(channel.url) if self.source_cache else None
+        headers = self.source_cache.conditional_headers(channel.url) if cached else None
+        started = time.perf_counter()
+        response, endpoint = self.fetch_hedged(channel.get_endpoints(), headers, stream=True)
+        self.record_phase(channel, 'network', started)
+        self.record_endpoint(channel, endpoint)
         if not response:
-            self.config.update_channel_stats(channel, False)
-            return configs
+            return None, 0
 
         response_time = time.time() - start_time
         
-        if channel.is_telegram:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            messages = soup.find_all('div', class_='tgme_widget_message_text')
-            
-            sorted_messages = sorted(
-                messages,
-                key=lambda message: self.extract_date_from_message(message) or datetime.min.replace(tzinfo=timezone.utc),
-                reverse=True
-            )
-            
-            for message in sorted_messages:
-                if not message or not message.text:
-                    continue
-                
-                message_date = self.extract_date_from_message(message)
-                if not self.is_config_valid(message.text, message_date):
-                    continue
-                
-                text = message.text
-                text_parts = text.split()
+        try:
+            configs = self.extract_subscription_configs(response, channel, cached)
+        except requests.RequestException as e:
+            logger.error(f"Error reading {channel.url}: {str(e)}")
+            return None, 0
+        finally:
+            response.close()
+        
+        return configs, response_time
+
+    def extract_subscription_configs(self, response: requests.Response, channel: ChannelConfig, cached: Optional[Dict]) -> List[str]:
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        
+        if cached and response.status_code == 304:
+            logger.info(f"{channel.url} not modified, reusing {len(cached['configs'])} cached configs")
+            self.source_cache.refresh_validators(channel.url, etag, last_modified)
+            channel.metrics.total_configs = cached.get('total_configs', len(cached['configs']))
+            return list(cached['configs'])
+        
+        encoding = response.encoding or 'utf-8'
+        hasher = hashlib.sha256()
+        chunks = hash_chunks(self.timed_chunks(response.iter_content(chunk_size=self.config.STREAM_CHUNK_SIZE), channel), hasher)
+        
+        if cached:
+            with tempfile.TemporaryFile() as spool:
+                for chunk in chunks:
+                    spool.write(chunk)
                 
-                for part in text_parts:
-                    part = part.strip()
-                    if not part:
-                        continue
-                        
-                    if part.startswith('ssconf://'):
-                        ssconf_configs = self.fetch_ssconf_configs(part)
-                        configs.extend(ssconf_configs)
-                        channel.metrics.total_configs += len(ssconf_configs)
-                    else:
-                        decoded_part = self.check_and_decode_base64(part)
-                        if decoded_part != part:
-                            found_configs = self.validator.split_configs(decoded_part)
-                            channel.metrics.total_configs += len(found_configs)
-                            configs.extend(found_configs)
+                if cached.get('body_hash') == hasher.hexdigest():
+                    logger.info(f"{channel.url} content unchanged, reusing {len(cached['configs'])} cached configs")
+                    self.source_cache.refresh_validators(channel.url, etag, last_modified)
+                    channel.metrics.total_configs = cached.get('total_configs', len(cached['configs']))
+                    return list(cached['configs'])
                 
-                found_configs = self.validator.split_configs(text)
-                channel.metrics.total_configs += len(found_configs)
-                configs.extend(found_configs)
+                spool.seek(0)
+                spooled_chunks = iter(lambda: spool.read(self.config.STREAM_CHUNK_SIZE), b'')
+                configs = self.extract_configs_from_lines(iter_text_lines(spooled_chunks, encoding), channel)
         else:
-            text = response.text
-            text_parts = text.split()
+            configs = self.extract_configs_from_lines(iter_text_lines(chunks, encoding), channel)
+        
+        if self.source_cache:
+            self.source_cache.put(channel.url, etag, last_modified, hasher.hexdigest(), configs, channel.metrics.total_configs)
+        
+        return configs
+
+    def read_local_source(self, channel: ChannelConfig) -> Tuple[Optional[List[str]], float]:
+        start_time = time.time()
+        path = url2pathname(urlparse(channel.url).path)
+        
+        if os.path.isdir(path):
+            paths = []
+            for root, dirs, names in os.walk(path):
+                dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+                paths.extend(os.path.join(root, name) for name in sorted(names) if not name.startswith('.'))
+        elif os.path.isfile(path):
+            paths = [path]
+        else:
+            logger.error(f"Local source not found: {path}")
+            return None, 0
+        
+        signature = hashlib.sha256()
+        for file_path in paths:
+            stat = os.stat(file_path)
+            signature.update(f"{file_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode('utf-8', 'surrogateescape'))
+        
+        cached = self.source_cache.get(channel.url) if self.source_cache else None
+        if cached and cached.get('body_hash') == signature.hexdigest():
+            logger.info(f"{channel.url} unchanged, reusing {len(cached['configs'])} cached configs")
+            channel.metrics.total_configs = cached.get('total_configs', len(cached['configs']))
+            return list(cached['configs']), time.time() - start_time
+        
+        configs = self.extract_configs_from_lines(self.iter_mapped_lines(paths, channel), channel)
+        logger.info(f"Read {len(paths)} local files from {path}")
+        
+        if self.source_cache:
+            self.source_cache.put(channel.url, None, None, signature.hexdigest(), configs, channel.metrics.total_configs)
+        
+        return configs, time.time() - start_time
+
+    def iter_mapped_lines(self, paths: List[str], channel: ChannelConfig) -> Iterator[str]:
+        for file_path in paths:
+            try:
+                with open(file_path, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if not size:
+                        continue
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        for line in iter(mapped.readline, b''):
+                            yield line.decode('utf-8', errors='replace')
+                    channel.metrics.phase_bytes['network'] = channel.metrics.phase_bytes.get('network', 0) + size
+            except (OSError, ValueError) as e:
+                logger.error(f"Error reading {file_path}: {str(e)}")
+
+    def fetch_telegram_messages(self, channel: ChannelConfig, cursor: int) -> Tuple[Optional[List[TelegramMessage]], float, bool]:
+        base_urls = [url.split('?', 1)[0] for url in channel.get_endpoints()]
+        base_url = base_urls[0]
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.config.MAX_CONFIG_AGE_DAYS)
+        messages: List[TelegramMessage] = []
+        response_time = 0.0
+        before = None
+        complete = False
+        
+        for page in range(self.config.TELEGRAM_MAX_PAGES):
+            start_time = time.time()
+            started = time.perf_counter()
+            if before is None:
+                response, endpoint = self.fetch_hedged(base_urls)
+                self.record_endpoint(channel, endpoint)
+                base_url = endpoint or base_url
+            else:
+                try:
+                    response = self.fetch_with_retry(f"{base_url}?before={before}")
+                except FetchSkipped as e:
+                    logger.warning(f"Not paging {channel.url} further: {str(e)}")
+                    response = None
+            if not response:
+                self.record_phase(channel, 'network', started)
+                if page == 0:
+                    return None, 0, False
+                break
+            
+            if page == 0:
+                response_time = time.time() - start_time
+            html = response.text
+            self.record_phase(channel, 'network', started, len(response.content))
+            response.close()
+            
+            started = time.perf_counter()
+            page_messages = extract_telegram_messages(html)
+            self.record_phase(channel, 'parse', started, len(html))
+            
+            messages.extend(m for m in page_messages if m[0] is None or m[0] > cursor)
+            
+            message_ids = [m[0] for m in page_messages if m[0] is not None]
+            message_dates = [m[1] for m in page_messages if m[1] is not None]
+            if not message_ids:
+                complete = True
+                break
+            
+            oldest_id = min(message_ids)
+            if oldest_id <= cursor + 1:
+                complete = True
+                break
+            if message_dates and min(message_dates) < cutoff_date:
+                complete = True
+                break
+            if before is not None and oldest_id >= before:
+                complete = True
+                break
+            before = oldest_id
+        
+        return messages, response_time, complete
+
+    def fetch_telegram_configs(self, channel: ChannelConfig) -> Tuple[Optional[List[str]], float]:
+        cached = self.source_cache.get(channel.url) if self.source_cache else None
+        cursor = cached.get('last_message_id', 0) if cached else 0
+        
+        messages, response_time, complete = self.fetch_telegram_messages(channel, cursor)
+        if messages is None:
+            return None, 0
+        
+        now = datetime.now(timezone.utc)
+        configs: List[str] = []
+        kept_messages: Dict[int, Dict] = {}
+        message_ids: List[int] = []
+        
+        sorted_messages = sorted(
+            messages,
+            key=lambda message: message[1] or datetime.min.replace(tzinfo=timezone.utc),
+            reverse=True
+        )
+        
+        extracted = []
+        for message_id, message_date, text in sorted_messages:
+            if message_id is not None:
+                message_ids.append(message_id)
             
-            for part in text_parts:
-                part = part.strip()
-                if not part:
+            if not text:
+                continue
+            
+            if not self.is_config_valid(text, message_date):
+                continue
+            
+            message_configs, ssconf_links = self.extract_message_configs(text, channel)
+            extracted.append((message_id, message_date, message_configs, ssconf_links))
+        
+        started = time.perf_counter()
+        resolved = self.resolve_ssconf_links(link for *_, links in extracted for link in links)
+        self.record_phase(channel, 'network', started)
+        
+        unresolved_ids: List[int] = []
+        for message_id, message_date, message_configs, ssconf_links in extracted:
+            for link in dict.fromkeys(ssconf_links):
+                ssconf_configs = resolved.get(link)
+                if ssconf_configs is None:
+                    if message_id is not None:
+                        unresolved_ids.append(message_id)
                     continue
-                    
-                decoded_part = self.check_and_decode_base64(part)
-                if decoded_part != part:
-                    found_configs = self.validator.split_configs(decoded_part)
-                    channel.metrics.total_configs += len(found_configs)
-                    configs.extend(found_configs)
+                message_configs.extend(ssconf_configs)
+                channel.metrics.total_configs += len(ssconf_configs)
             
-            found_configs = self.validator.split_configs(text)
-            channel.metrics.total_configs += len(found_configs)
-            configs.extend(found_configs)
+            configs.extend(message_configs)
+            
+            if message_id is not None and message_configs:
+                kept_messages[message_id] = {
+                    'id': message_id,
+                    'date': (message_date or now).isoformat(),
+                    'configs': message_configs
+                }
         
-        configs = list(set(configs))
+        reused = 0
+        for cached_message in (cached or {}).get('messages', []):
+            message_id = cached_message.get('id')
+            if message_id in kept_messages:
+                continue
+            try:
+                message_date = datetime.fromisoformat(cached_message['date'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not self.is_config_valid('', message_date):
+                continue
+            
+            kept_messages[message_id] = cached_message
+            configs.extend(cached_message.get('configs', []))
+            reused += len(cached_message.get('configs', []))
         
-        for config in configs[:]:
-            for protocol in self.config.SUPPORTED_PROTOCOLS:
-                if config.startswith(protocol):
-                    processed_configs = self.process_config(config, channel)
-                    if not processed_configs:
-                        configs.remove(config)
-                    break
+        if reused:
+            channel.metrics.total_configs += reused
+            logger.info(f"{channel.url}: {len(messages)} new messages, reused {reused} configs from earlier messages")
+        
+        if unresolved_ids:
+            message_ids = [message_id for message_id in message_ids if message_id < min(unresolved_ids)]
+            logger.info(f"{channel.url}: keeping cursor before message {min(unresolved_ids)} with unresolved ssconf links")
+        if not complete:
+            message_ids = []
+            logger.info(f"{channel.url}: paging stopped before message {cursor + 1}, keeping cursor at {cursor}")
+        last_message_id = max([cursor] + message_ids)
+        
+        if self.source_cache:
+            self.source_cache.put_messages(channel.url, last_message_id, list(kept_messages.values()))
+        self.record_message_dates(channel, kept_messages.values())
+        
+        return configs, response_time
+
+    def record_message_dates(self, channel: ChannelConfig, messages: Iterable[Dict]):
+        dates: Dict[str, datetime] = {}
+        for message in messages:
+            try:
+                message_date = datetime.fromisoformat(message['date'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            for config in message.get('configs', []):
+                if config not in dates or message_date > dates[config]:
+                    dates[config] = message_date
+        self.config_dates[channel.url] = dates
+
+    def extract_message_configs(self, text: str, channel: ChannelConfig) -> Tuple[List[str], List[str]]:
+        configs: List[str] = []
+        ssconf_links: List[str] = []
+        text_parts: List[str] = []
+        
+        for part in text.split():
+            if part.startswith('ssconf://'):
+                ssconf_links.append(part)
+            else:
+                text_parts.append(part)
+        
+        configs.extend(self.decode_base64_parts(text_parts, channel))
+        
+        started = time.perf_counter()
+        found_configs = self.validator.split_configs(text)
+        self.record_phase(channel, 'split', started, len(text))
+        channel.metrics.total_configs += len(found_configs)
+        configs.extend(found_configs)
+        
+        return configs, ssconf_links
+
+    def extract_configs_from_lines(self, lines: Iterable[str], channel: ChannelConfig) -> List[str]:
+        return list(dict.fromkeys(self.iter_configs_from_lines(lines, channel)))
+
+    def iter_configs_from_lines(self, lines: Iterable[str], channel: ChannelConfig) -> Iterator[str]:
+        seen_line_configs: Set[str] = set()
+        
+        for line in lines:
+            yield from self.decode_base64_parts(line.split(), channel)
+            
+            started = time.perf_counter()
+            line_configs = list(self.validator.iter_split_configs((line,), seen_line_configs))
+            self.record_phase(channel, 'split', started, len(line))
+            channel.metrics.total_configs += len(line_configs)
+            yield from line_configs
+
+    def cached_source_configs(self, channel: ChannelConfig) -> Optional[List[str]]:
+        cached = self.source_cache.get(channel.url) if self.source_cache else None
+        if not cached:
+            return None
+        
+        if 'messages' not in cached:
+            return list(cached.get('configs', []))
+        
+        configs = []
+        self.record_message_dates(channel, cached['messages'])
+        for message in cached['messages']:
+            try:
+                message_date = datetime.fromisoformat(message['date'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if self.is_config_valid('', message_date):
+                configs.extend(message.get('configs', []))
+        return configs
+
+    def is_channel_due(self, channel: ChannelConfig, now: datetime) -> bool:
+        if not self.config.ENABLE_ADAPTIVE_SCHEDULING or not self.source_cache:
+            return True
+        if not channel.next_due_time or not self.source_cache.get(channel.url):
+            return True
+        return now >= channel.next_due_time - timedelta(hours=self.config.SCHEDULE_TOLERANCE_HOURS)
+
+    def update_schedule(self, channel: ChannelConfig, configs: Optional[List[str]],
+                        previous_configs: Optional[Union[Set[str], DigestSet]], previous_check: Optional[datetime]):
+        now = datetime.now(timezone.utc)
+        if configs is None:
+            channel.next_due_time = None
+            return
+        
+        if previous_configs is None or previous_check is None:
+            channel.fetch_interval = self.config.SCHEDULE_MIN_INTERVAL
+        else:
+            new_configs = sum(1 for config in set(configs) if config not in previous_configs)
+            elapsed_hours = max(1.0, (now - previous_check).total_seconds() / 3600)
+            sample_rate = new_configs / elapsed_hours
+            if channel.metrics.new_config_rate == 0:
+                channel.metrics.new_config_rate = sample_rate
+            else:
+                alpha = self.config.SCHEDULE_RATE_ALPHA
+                channel.metrics.new_config_rate = (channel.metrics.new_config_rate * (1 - alpha)) + (sample_rate * alpha)
+            
+            if channel.metrics.new_config_rate > 0:
+                interval = self.config.SCHEDULE_TARGET_NEW_CONFIGS / channel.metrics.new_config_rate
+            else:
+                interval = max(1.0, channel.fetch_interval * 2)
+            channel.fetch_interval = min(self.config.SCHEDULE_MAX_INTERVAL, max(self.config.SCHEDULE_MIN_INTERVAL, interval))
+        
+        channel.next_due_time = now + timedelta(hours=channel.fetch_interval)
+
+    def process_source_configs(self, channel: ChannelConfig, configs: Optional[List[str]], response_time: float,
+                               fetched: bool = True) -> List[str]:
+        if channel.url.startswith('ssconf://'):
+            if configs:
+                self.config.update_channel_stats(channel, True, response_time)
+            return configs or []
+        
+        if configs is None:
+            self.config.update_channel_stats(channel, False)
+            return []
+        
+        configs = list(dict.fromkeys(configs))
+        
+        validation_bytes = sum(len(config) for config in configs)
+        started = time.perf_counter()
+        supported = tuple(self.config.SUPPORTED_PROTOCOLS)
+        enabled = tuple(protocol for protocol in supported if self.config.is_protocol_enabled(protocol))
+        candidates = [config for config in configs if config.startswith(enabled)]
+        rejected = {config for config in configs if config.startswith(supported) and not config.startswith(enabled)}
+        for config, validated in zip(candidates, self.validator.validate_many(candidates)):
+            if not self.process_config(config, validated, channel):
+                rejected.add(config)
+        if rejected:
+            configs = [config for config in configs if config not in rejected]
+        
+        self.record_phase(channel, 'validation', started, validation_bytes)
+        
+        if not fetched:
+            return configs
         
         if len(configs) >= self.config.MIN_CONFIGS_PER_CHANNEL:
             self.config.update_channel_stats(channel, True, response_time)
@@ -189,53 +841,34 @@ class ConfigFetcher:
         
         return configs
 
-    def process_config(self, config: str, channel: ChannelConfig) -> List[str]:
-        processed_configs = []
+    def process_config(self, source_config: str, validated: Optional[ValidatedConfig], channel: ChannelConfig) -> List[str]:
+        if not validated:
+            return []
         
-        if config.startswith('hy2://'):
-            config = self.validator.normalize_hysteria2_protocol(config)
-            
-        for protocol in self.config.SUPPORTED_PROTOCOLS:
-            aliases = self.config.SUPPORTED_PROTOCOLS[protocol].get('aliases', [])
-            protocol_match = False
-            
-            if config.startswith(protocol):
-                protocol_match = True
-            else:
-                for alias in aliases:
-                    if config.startswith(alias):
-                        protocol_match = True
-                        config = config.replace(alias, protocol, 1)
-                        break
-                        
-            if protocol_match:
-                if not self.config.is_protocol_enabled(protocol):
-                    break
-                if protocol == "vmess://":
-                    config = self.validator.clean_vmess_config(config)
-                
-                clean_config = self.validator.clean_config(config)
-                if self.validator.validate_protocol_config(clean_config, protocol):
-                    channel.metrics.valid_configs += 1
-                    channel.metrics.protocol_counts[protocol] = channel.metrics.protocol_counts.get(protocol, 0) + 1
-                    
-                    if clean_config not in self.seen_configs:
-                        channel.metrics.unique_configs += 1
-                        self.seen_configs.add(clean_config)
-                        processed_configs.append(clean_config)
-                        self.protocol_counts[protocol] += 1
-                break
-                
-        return processed_configs
+        protocol = validated.protocol
+        channel.metrics.valid_configs += 1
+        channel.metrics.protocol_counts[protocol] = channel.metrics.protocol_counts.get(protocol, 0) + 1
+        
+        config_key = self.config_key(validated)
+        key_digest = config_digest(config_key)
+        if channel.url not in self.channel_keys:
+            self.channel_keys[channel.url] = DigestSet()
+        self.channel_keys[channel.url].add_digest(key_digest)
+        if config_key in self.seen_configs:
+            return []
+        
+        self.config_ranks.put(config_digest(source_config), key_digest)
+        channel.metrics.unique_configs += 1
+        self.seen_configs.add(config_key)
+        self.protocol_counts[protocol] += 1
+        return [validated.config]
 
-    def extract_date_from_message(self, message) -> Optional[datetime]:
-        try:
-            time_element = message.find_parent('div', class_='tgme_widget_message').find('time')
-            if time_element and 'datetime' in time_element.attrs:
-                return datetime.fromisoformat(time_element['datetime'].replace('Z', '+00:00'))
-        except Exception:
-            pass
-        return None
+    @staticmethod
+    def config_key(validated: ValidatedConfig) -> str:
+        if validated.protocol == 'vmess://' and isinstance(validated.payload, dict):
+            data = parser.normalize_vmess(dict(validated.payload))
+            return (parser.data_key('vmess', data) if data else None) or validated.config
+        return canonical_key(validated.config) or validated.config
 
     def is_config_valid(self, config_text: str, date: Optional[datetime]) -> bool:
         if not date:
@@ -243,59 +876,220 @@ class ConfigFetcher:
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.config.MAX_CONFIG_AGE_DAYS)
         return date >= cutoff_date
 
-    def balance_protocols(self, configs: List[str]) -> List[str]:
-        protocol_configs: Dict[str, List[str]] = {p: [] for p in self.config.SUPPORTED_PROTOCOLS}
+    def config_rank(self, config: str, channel_scores: Dict[str, float], now: datetime) -> float:
+        key_digest = self.config_ranks.get(config_digest(config))
+        channel_url = self.config_sources.get(config) if key_digest is not None else None
+        
+        message_date = self.config_dates.get(channel_url, {}).get(config)
+        if message_date:
+            age_days = (now - message_date).total_seconds() / 86400
+            freshness = max(0.0, min(1.0, 1 - age_days / max(1, self.config.MAX_CONFIG_AGE_DAYS)))
+        else:
+            freshness = 0.5
+        
+        channel_score = channel_scores.get(channel_url, self.config.CHANNEL_DEFAULT_SCORE) / 100
+        reposts = 1
+        for level in self.repost_levels:
+            if key_digest is None or not level.contains_digest(key_digest):
+                break
+            reposts += 1
+        repost_score = (reposts - 1) / max(1, self.config.RANK_MAX_REPOSTS - 1)
+        
+        return (self.config.RANK_WEIGHT_FRESHNESS * freshness +
+                self.config.RANK_WEIGHT_CHANNEL * channel_score +
+                self.config.RANK_WEIGHT_REPOSTS * repost_score)
+
+    def balance_protocols(self, configs: Iterable[str]) -> List[str]:
+        channel_scores = {channel.url: channel.metrics.overall_score for channel in self.config.SOURCE_URLS}
+        now = datetime.now(timezone.utc)
+        protocol_heaps: Dict[str, List[Tuple[float, str]]] = {p: [] for p in self.config.SUPPORTED_PROTOCOLS}
+        protocol_totals: Dict[str, int] = {p: 0 for p in self.config.SUPPORTED_PROTOCOLS}
+        
         for config in configs:
+            rank = self.config_rank(config, channel_scores, now)
             if config.startswith('hy2://'):
                 config = self.validator.normalize_hysteria2_protocol(config)
                 
             for protocol in self.config.SUPPORTED_PROTOCOLS:
                 if config.startswith(protocol):
-                    protocol_configs[protocol].append(config)
+                    protocol_totals[protocol] += 1
+                    heap = protocol_heaps[protocol]
+                    if len(heap) < self.config.SUPPORTED_PROTOCOLS[protocol]["max_configs"]:
+                        heapq.heappush(heap, (rank, config))
+                    elif heap and (rank, config) > heap[0]:
+                        heapq.heapreplace(heap, (rank, config))
                     break
         
-        total_configs = sum(len(configs) for configs in protocol_configs.values())
-        if total_configs == 0:
+        if sum(protocol_totals.values()) == 0:
             return []
             
         balanced_configs: List[str] = []
         sorted_protocols = sorted(
-            protocol_configs.items(),
+            protocol_heaps.items(),
             key=lambda x: (
                 self.config.SUPPORTED_PROTOCOLS[x[0]]["priority"],
-                len(x[1])
+                protocol_totals[x[0]]
             ),
             reverse=True
         )
         
-        for protocol, protocol_config_list in sorted_protocols:
+        for protocol, heap in sorted_protocols:
             protocol_info = self.config.SUPPORTED_PROTOCOLS[protocol]
-            if len(protocol_config_list) >= protocol_info["min_configs"]:
-                max_configs = min(
-                    protocol_info["max_configs"],
-                    len(protocol_config_list)
-                )
-                balanced_configs.extend(protocol_config_list[:max_configs])
-            elif protocol_info["flexible_max"] and len(protocol_config_list) > 0:
-                balanced_configs.extend(protocol_config_list)
+            if protocol_totals[protocol] >= protocol_info["min_configs"] or (protocol_info["flexible_max"] and heap):
+                balanced_configs.extend(config for _, config in sorted(heap, reverse=True))
         
         return balanced_configs
 
+    def record_config_sources(self, channel: ChannelConfig, configs: List[str]):
+        for config in configs:
+            self.config_sources.setdefault(config, channel.url)
+            if config.startswith('hy2://'):
+                self.config_sources.setdefault(self.validator.normalize_hysteria2_protocol(config), channel.url)
+
+    def analyze_overlap(self, channels: List[ChannelConfig]):
+        channels = [channel for channel in channels if len(self.channel_keys.get(channel.url, ()))]
+        sizes = [len(self.channel_keys[channel.url]) for channel in channels]
+        
+        marginal_counts = [0] * len(channels)
+        sole_holder_counts = [0] * len(channels)
+        shared_counts: Dict[Tuple[int, int], int] = {}
+        repost_levels = [DigestSet() for _ in range(self.config.RANK_MAX_REPOSTS - 1)]
+        merged = heapq.merge(*(zip(self.channel_keys[channel.url], itertools.repeat(index))
+                               for index, channel in enumerate(channels)))
+        for key, group in itertools.groupby(merged, key=lambda item: item[0]):
+            holders = [index for _, index in group]
+            marginal_counts[holders[0]] += 1
+            if len(holders) == 1:
+                sole_holder_counts[holders[0]] += 1
+                continue
+            for level in repost_levels[:len(holders) - 1]:
+                level.add_digest(key)
+            for pair in itertools.combinations(holders, 2):
+                shared_counts[pair] = shared_counts.get(pair, 0) + 1
+        
+        pairs = []
+        for i in range(len(channels)):
+            for j in range(i + 1, len(channels)):
+                intersection = shared_counts.get((i, j), 0)
+                union = sizes[i] + sizes[j] - intersection
+                pairs.append((round(intersection / union, 3) if union else 0.0, channels[i].url, channels[j].url))
+        pairs.sort(reverse=True)
+        
+        for channel, size, marginal, sole_holder in zip(channels, sizes, marginal_counts, sole_holder_counts):
+            channel.metrics.exclusive_ratio = marginal / size
+            
+            if channel.metrics.exclusive_ratio < self.config.REDUNDANT_CHANNEL_MIN_UNIQUE_RATIO:
+                channel.metrics.low_contribution_runs += 1
+            else:
+                channel.metrics.low_contribution_runs = 0
+            
+            if not channel.enabled or not self.config.is_channel_redundant(channel):
+                continue
+            if sole_holder:
+                logger.info(f"Keeping {channel.url}: {marginal}/{size} of its configs were new after higher-priority sources, "
+                            f"but {sole_holder} are found nowhere else")
+                continue
+            channel.enabled = False
+            logger.warning(f"Disabling {channel.url}: only {marginal}/{size} of its configs were not supplied by higher-priority sources "
+                           f"for {channel.metrics.low_contribution_runs} runs")
+        
+        self.repost_levels = repost_levels
+        self.overlap_report = {
+            'min_jaccard': self.config.OVERLAP_REPORT_MIN_JACCARD,
+            'pairs': [
+                {'channels': [first, second], 'jaccard': jaccard}
+                for jaccard, first, second in pairs[:self.config.OVERLAP_REPORT_MAX_PAIRS]
+                if jaccard >= self.config.OVERLAP_REPORT_MIN_JACCARD
+            ]
+        }
+        
+        if pairs:
+            logger.info(f"Highest source overlap: {pairs[0][1]} and {pairs[0][2]} (Jaccard {pairs[0][0]:.2f})")
+
+    def is_quota_reached(self) -> bool:
+        if self.config.use_maximum_power:
+            return False
+        
+        enabled_protocols = [p for p in self.config.SUPPORTED_PROTOCOLS if self.config.is_protocol_enabled(p)]
+        if not enabled_protocols:
+            return False
+        
+        return all(
+            self.protocol_counts[protocol] >= self.config.SUPPORTED_PROTOCOLS[protocol]["max_configs"] * self.config.QUOTA_HEADROOM
+            for protocol in enabled_protocols
+        )
+
+    def reuse_cached_configs(self, channel: ChannelConfig) -> List[str]:
+        self.reset_run_metrics(channel)
+        configs = self.cached_source_configs(channel) or []
+        channel.metrics.total_configs = len(configs)
+        return self.process_source_configs(channel, configs, 0, fetched=False)
+
     def fetch_all_configs(self) -> List[str]:
         all_configs: List[str] = []
         enabled_channels = self.config.get_enabled_channels()
         total_channels = len(enabled_channels)
+        if not total_channels:
+            return []
         
-        for idx, channel in enumerate(enabled_channels, 1):
-            logger.info(f"Fetching configs from {channel.url} ({idx}/{total_channels})")
-            channel_configs = self.fetch_configs_from_source(channel)
-            all_configs.extend(channel_configs)
+        now = datetime.now(timezone.utc)
+        due_channels = [channel for channel in enabled_channels if self.is_channel_due(channel, now)]
+        max_workers = max(1, min(self.config.FETCH_MAX_WORKERS, len(due_channels)))
+        logger.info(f"Fetching {len(due_channels)} of {total_channels} sources with {max_workers} workers...")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            previous_state = {}
+            for channel in due_channels:
+                previous_configs = self.cached_source_configs(channel)
+                previous_set = None
+                if previous_configs is not None:
+                    previous_set = DigestSet() if self.config.ENABLE_COMPACT_DEDUPE else set()
+                    previous_set.update(previous_configs)
+                previous_state[channel.url] = (previous_set, channel.last_check_time)
+                futures[channel.url] = executor.submit(self.download_source, channel)
             
-            if idx < total_channels:
-                time.sleep(2)
+            for idx, channel in enumerate(enabled_channels, 1):
+                future = futures.get(channel.url)
+                if future is None:
+                    channel_configs = self.reuse_cached_configs(channel)
+                    logger.info(f"Reused {len(channel_configs)} cached configs from {channel.url}, next fetch due {channel.next_due_time.isoformat()} ({idx}/{total_channels})")
+                else:
+                    skip_reason = None
+                    try:
+                        configs, response_time = future.result()
+                    except FetchSkipped as e:
+                        skip_reason = str(e)
+                    except Exception as e:
+                        logger.error(f"Error fetching {channel.url}: {str(e)}")
+                        configs, response_time = None, 0
+                    
+                    if skip_reason:
+                        self.discard_source_state(channel)
+                        channel_configs = self.reuse_cached_configs(channel)
+                        logger.warning(f"Skipped {channel.url} ({skip_reason}), reused {len(channel_configs)} cached configs ({idx}/{total_channels})")
+                    else:
+                        previous_configs, previous_check = previous_state[channel.url]
+                        self.commit_source_state(channel)
+                        channel_configs = self.process_source_configs(channel, configs, response_time)
+                        self.update_schedule(channel, configs, previous_configs, previous_check)
+                        logger.info(f"Fetched {len(channel_configs)} configs from {channel.url} ({idx}/{total_channels})")
+                
+                self.record_config_sources(channel, channel_configs)
+                all_configs.extend(channel_configs)
+                
+                if idx < total_channels and self.is_quota_reached():
+                    cancelled = sum(1 for remaining in enabled_channels[idx:] if remaining.url in futures and futures[remaining.url].cancel())
+                    logger.info(f"Protocol quotas reached after {idx}/{total_channels} sources, "
+                                f"skipping the remaining {total_channels - idx} ({cancelled} downloads cancelled)")
+                    break
+        
+        self.ssconf_executor.shutdown(wait=False, cancel_futures=True)
+        self.hedge_executor.shutdown(wait=False)
+        self.analyze_overlap(enabled_channels)
         
         if all_configs:
-            all_configs = self.balance_protocols(sorted(set(all_configs)))
+            all_configs = self.balance_protocols(dict.fromkeys(all_configs))
             return all_configs
         return []
 
@@ -317,17 +1111,25 @@ def save_configs(configs: List[str], config: ProxyConfig):
     except Exception as e:
         logger.error(f"Error saving configs: {str(e)}")
 
-def save_channel_stats(config: ProxyConfig):
+def save_channel_stats(config: ProxyConfig, overlap: Optional[Dict] = None):
     try:
         stats = {
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'channels': []
         }
+        if overlap:
+            stats['overlap'] = overlap
         
         for channel in config.SOURCE_URLS:
             channel_stats = {
                 'url': channel.url,
                 'enabled': channel.enabled,
+                'last_check': channel.last_check_time.isoformat() if channel.last_check_time else None,
+                'preferred_endpoint': channel.preferred_url,
+                'schedule': {
+                    'fetch_interval_hours': round(channel.fetch_interval, 2),
+                    'next_due': channel.next_due_time.isoformat() if channel.next_due_time else None
+                },
                 'metrics': {
                     'total_configs': channel.metrics.total_configs,
                     'valid_configs': channel.metrics.valid_configs,
@@ -336,6 +1138,13 @@ def save_channel_stats(config: ProxyConfig):
                     'success_count': channel.metrics.success_count,
                     'fail_count': channel.metrics.fail_count,
                     'overall_score': round(channel.metrics.overall_score, 2),
+                    'new_config_rate': round(channel.metrics.new_config_rate, 3),
+                    'working_ratio': round(channel.metrics.working_ratio, 3) if channel.metrics.working_ratio is not None else None,
+                    'tested_configs': channel.metrics.tested_configs,
+                    'exclusive_ratio': round(channel.metrics.exclusive_ratio, 3) if channel.metrics.exclusive_ratio is not None else None,
+                    'low_contribution_runs': channel.metrics.low_contribution_runs,
+                    'phase_times': {phase: round(seconds, 3) for phase, seconds in channel.metrics.phase_times.items()},
+                    'phase_bytes': channel.metrics.phase_bytes,
                     'last_success': channel.metrics.last_success_time.replace(tzinfo=timezone.utc).isoformat() if channel.metrics.last_success_time else None,
                     'protocol_counts': channel.metrics.protocol_counts
                 }
@@ -353,11 +1162,26 @@ def save_channel_stats(config: ProxyConfig):
 def main():
     try:
         config = ProxyConfig()
+        provenance = ConfigProvenance(config.PROVENANCE_FILE)
+        channels = {channel.url: channel for channel in config.SOURCE_URLS}
+        for url, (tested, working) in provenance.channel_yields().items():
+            if url in channels:
+                config.update_channel_yield(channels[url], tested, working)
+        
         fetcher = ConfigFetcher(config)
-        configs = fetcher.fetch_all_configs()
+        try:
+            configs = fetcher.fetch_all_configs()
+        finally:
+            if fetcher.egress_pool:
+                fetcher.egress_pool.close()
+        
+        base64_stats = base64_codec.cache.stats()
+        logger.info(f"Base64 decode cache: {base64_stats['hits']} hits, {base64_stats['misses']} misses, "
+                    f"{base64_stats['evictions']} evictions, {base64_stats['entries']} entries")
         
         if configs:
             save_configs(configs, config)
+            provenance.record_sources({c: fetcher.config_sources[c] for c in configs if c in fetcher.config_sources})
             logger.info(f"Successfully processed {len(configs)} configs at {datetime.now(timezone.utc)}")
             
             for protocol, count in fetcher.protocol_counts.items():
@@ -365,7 +1189,11 @@ def main():
         else:
             logger.error("No valid configs found!")
             
-        save_channel_stats(config)
+        save_channel_stats(config, fetcher.overlap_report)
+        
+        if fetcher.source_cache:
+            fetcher.source_cache.save(channel.url for channel in config.SOURCE_URLS)
+        fetcher.circuit_breaker.save()
             
     except Exception as e:
         logger.error(f"Error in main execution: {str(e)}")
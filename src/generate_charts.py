@@ -2,6 +2,13 @@ import json
 import os
 from datetime import datetime
 
+def format_bytes(size):
+    for unit in ['B', 'KB', 'MB']:
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
 def generate_basic_svg(stats_data):
     channels = stats_data.get('channels', [])
     sorted_channels = sorted(channels, key=lambda x: x['metrics']['overall_score'], reverse=True)
@@ -174,7 +181,70 @@ def generate_html_report(stats_data):
                         </tbody>
                     </table>
                 </div>
-            </div>
+            </div>'''
+
+    timed_channels = [c for c in channels if c['metrics'].get('phase_times')]
+    timed_channels.sort(key=lambda x: sum(x['metrics']['phase_times'].values()), reverse=True)
+    
+    if timed_channels:
+        fetch_phases = list(dict.fromkeys(phase for c in timed_channels for phase in c['metrics']['phase_times']))
+        phase_headers = ''.join(
+            f'''
+                                <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">{phase}</th>'''
+            for phase in fetch_phases
+        )
+        html += f'''
+
+            <div class="bg-white rounded-lg shadow-lg p-6 mb-8">
+                <h3 class="text-xl font-semibold text-gray-800 mb-6">Fetch Time Breakdown</h3>
+                <div class="overflow-x-auto">
+                    <table class="min-w-full divide-y divide-gray-200">
+                        <thead class="bg-gray-50">
+                            <tr>
+                                <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Channel</th>
+                                <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Total</th>{phase_headers}
+                                <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Downloaded</th>
+                            </tr>
+                        </thead>
+                        <tbody class="bg-white divide-y divide-gray-200">'''
+        
+        for channel in timed_channels:
+            phase_times = channel['metrics']['phase_times']
+            phase_bytes = channel['metrics'].get('phase_bytes', {})
+            total_time = sum(phase_times.values())
+            time_color = 'red' if total_time >= 30 else 'yellow' if total_time >= 10 else 'green'
+            slowest_phase = max(fetch_phases, key=lambda phase: phase_times.get(phase, 0))
+            
+            phase_cells = ''.join(
+                f'''
+                                <td class="px-6 py-4 whitespace-nowrap text-sm {'font-semibold text-gray-900' if phase == slowest_phase else 'text-gray-500'}">
+                                    {phase_times.get(phase, 0):.2f}s
+                                </td>'''
+                for phase in fetch_phases
+            )
+            
+            html += f'''
+                            <tr>
+                                <td class="px-6 py-4 whitespace-nowrap text-sm font-medium text-gray-900">
+                                    {channel['url'].split('/')[-1]}
+                                </td>
+                                <td class="px-6 py-4 whitespace-nowrap">
+                                    <span class="px-2 inline-flex text-xs leading-5 font-semibold rounded-full bg-{time_color}-100 text-{time_color}-800">
+                                        {total_time:.2f}s
+                                    </span>
+                                </td>{phase_cells}
+                                <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
+                                    {format_bytes(phase_bytes.get('network', 0))}
+                                </td>
+                            </tr>'''
+        
+        html += '''
+                        </tbody>
+                    </table>
+                </div>
+            </div>'''
+
+    html += '''
         </div>
     </body>
     </html>'''
@@ -0,0 +1,120 @@
+import os
+import sys
+import struct
+import marshal
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PCv1'
+RECORD_HEADER = struct.Struct('<QI')
+MISSING = object()
+
+def source_version(*paths: str) -> bytes:
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{sys.version_info[0]}.{sys.version_info[1]}/{marshal.version}".encode())
+    for path in paths:
+        with open(path, 'rb') as f:
+            hasher.update(f.read())
+    return hasher.digest()
+
+class ParseCache:
+    def __init__(self, cache_file: str, version: bytes, max_bytes: int):
+        self.cache_file = cache_file
+        self.version = version
+        self.max_bytes = max(0, max_bytes)
+        self.lock = threading.Lock()
+        self.entries: 'OrderedDict[int, bytes]' = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.cache_file, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Error loading parse cache, starting empty: {str(e)}")
+            return
+
+        header_size = len(MAGIC) + len(self.version)
+        if data[:header_size] != MAGIC + self.version:
+            logger.info(f"Parse cache {self.cache_file} was written by another parser version, starting empty")
+            return
+
+        view = memoryview(data)
+        offset = header_size
+        while offset + RECORD_HEADER.size <= len(data):
+            key, length = RECORD_HEADER.unpack_from(data, offset)
+            offset += RECORD_HEADER.size
+            if offset + length > len(data):
+                break
+            self.entries[key] = bytes(view[offset:offset + length])
+            self.size += RECORD_HEADER.size + length
+            offset += length
+        logger.info(f"Loaded {len(self.entries)} parsed configs from {self.cache_file}")
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            records = list(self.entries.items())
+            self.dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+            temp_file = f"{self.cache_file}.tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(MAGIC + self.version)
+                for key, payload in records:
+                    f.write(RECORD_HEADER.pack(key, len(payload)))
+                    f.write(payload)
+            os.replace(temp_file, self.cache_file)
+            logger.info(f"Parse cache saved to {self.cache_file} ({len(records)} entries, "
+                        f"{self.hits} hits, {self.misses} misses)")
+        except Exception as e:
+            logger.error(f"Error saving parse cache: {str(e)}")
+
+    def get(self, key: int) -> Any:
+        with self.lock:
+            payload = self.entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return MISSING
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.dirty = True
+        try:
+            return marshal.loads(payload)
+        except (EOFError, ValueError, TypeError):
+            return MISSING
+
+    def put(self, key: int, value: Any) -> Any:
+        try:
+            payload = marshal.dumps(value)
+        except ValueError:
+            return value
+
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= RECORD_HEADER.size + len(previous)
+            self.entries[key] = payload
+            self.size += RECORD_HEADER.size + len(payload)
+            while self.size > self.max_bytes and self.entries:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= RECORD_HEADER.size + len(evicted)
+            self.dirty = True
+        return value
+
+    def stats(self) -> Tuple[int, int, int]:
+        with self.lock:
+            return self.hits, self.misses, len(self.entries)
@@ -0,0 +1,148 @@
+from functools import lru_cache
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+import config_parser as parser
+import transport_builder
+
+OUTBOUND_PROTOCOLS = ('vmess', 'vless', 'trojan', 'hysteria2', 'ss')
+
+class ProxyEndpoint:
+    __slots__ = ('uri', 'protocol', 'address', 'port', 'name', 'data', 'key', '_params')
+
+    def __init__(self, uri: str, protocol: str, data: Dict):
+        self.uri: str = uri
+        self.protocol: str = protocol
+        self.data: Dict = data
+        self.address: str = data['add'] if protocol == 'vmess' else data['address']
+        self.port: int = int(data['port'])
+        self.name: str = data.get('name') or ''
+        parts = parser.key_parts(protocol, data)
+        self.key: Optional[str] = '|'.join(str(part) for part in parts) if parts else None
+        self._params: Optional[Dict[str, str]] = None
+
+    def __repr__(self) -> str:
+        return f"ProxyEndpoint({self.protocol}, {self.address}:{self.port})"
+
+    @property
+    def query(self) -> str:
+        return self.uri.split('#', 1)[0].partition('?')[2]
+
+    @property
+    def params(self) -> Dict[str, str]:
+        if self._params is None:
+            self._params = {k: v[0] for k, v in parse_qs(self.query).items() if v}
+        return self._params
+
+    def to_singbox_outbound(self, tag: str) -> Optional[Dict]:
+        data = self.data
+        if self.protocol == 'vmess':
+            transport, tls = transport_builder.build_singbox_settings(data)
+            return {
+                "type": "vmess", "tag": tag, "server": self.address, "server_port": self.port,
+                "uuid": data['id'], "security": data.get('scy', 'auto'), "alter_id": int(data.get('aid', 0)),
+                "transport": transport, "tls": tls
+            }
+        if self.protocol == 'vless':
+            transport, tls = transport_builder.build_singbox_settings(data)
+            return {
+                "type": "vless", "tag": tag, "server": self.address, "server_port": self.port,
+                "uuid": data['uuid'], "flow": data.get('flow', ''), "tls": tls, "transport": transport
+            }
+        if self.protocol == 'trojan':
+            transport, tls = transport_builder.build_singbox_settings(data)
+            return {
+                "type": "trojan", "tag": tag, "server": self.address, "server_port": self.port,
+                "password": data['password'], "tls": tls, "transport": transport
+            }
+        if self.protocol == 'hysteria2':
+            transport, tls = transport_builder.build_singbox_settings(data)
+            return {
+                "type": "hysteria2", "tag": tag, "server": self.address, "server_port": self.port,
+                "password": data['password'], "tls": tls
+            }
+        if self.protocol == 'ss':
+            return {
+                "type": "shadowsocks", "tag": tag, "server": self.address, "server_port": self.port,
+                "method": data['method'], "password": data['password']
+            }
+        return None
+
+    def to_xray_outbound(self, level: Optional[int] = None) -> Optional[Dict]:
+        data = self.data
+        extra = {"level": level} if level is not None else {}
+        if self.protocol == 'vmess':
+            return {
+                "protocol": "vmess",
+                "settings": {
+                    "vnext": [{
+                        "address": self.address,
+                        "port": self.port,
+                        "users": [{
+                            "id": data['id'],
+                            "alterId": int(data.get('aid', 0)),
+                            "security": data.get('scy', 'auto'),
+                            **extra
+                        }]
+                    }]
+                },
+                "streamSettings": transport_builder.build_xray_settings(data)
+            }
+        if self.protocol == 'vless':
+            return {
+                "protocol": "vless",
+                "settings": {
+                    "vnext": [{
+                        "address": self.address,
+                        "port": self.port,
+                        "users": [{
+                            "id": data['uuid'],
+                            "flow": data.get('flow', ''),
+                            "encryption": "none",
+                            **extra
+                        }]
+                    }]
+                },
+                "streamSettings": transport_builder.build_xray_settings(data)
+            }
+        if self.protocol == 'trojan':
+            return {
+                "protocol": "trojan",
+                "settings": {
+                    "servers": [{
+                        "address": self.address,
+                        "port": self.port,
+                        "password": data['password'],
+                        **extra
+                    }]
+                },
+                "streamSettings": transport_builder.build_xray_settings(data)
+            }
+        if self.protocol == 'ss':
+            return {
+                "protocol": "shadowsocks",
+                "settings": {
+                    "servers": [{
+                        "address": self.address,
+                        "port": self.port,
+                        "method": data['method'],
+                        "password": data['password'],
+                        **extra
+                    }]
+                },
+                "streamSettings": {"network": "tcp"}
+            }
+        return None
+
+@lru_cache(maxsize=8192)
+def parse_endpoint(config: str) -> Optional[ProxyEndpoint]:
+    parsed = parser.parse_config(config)
+    if not parsed:
+        return None
+    try:
+        return ProxyEndpoint(config, *parsed)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def canonical_key(config: str) -> Optional[str]:
+    endpoint = parse_endpoint(config)
+    return endpoint.key if endpoint else None
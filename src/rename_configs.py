@@ -3,11 +3,10 @@ import base64
 import sys
 import os
 from typing import Dict, Optional, List, Tuple
-from urllib.parse import urlparse, parse_qs, unquote
 import logging
 import re
 import binascii
-import config_parser as parser
+from proxy_endpoint import parse_endpoint, OUTBOUND_PROTOCOLS
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -306,87 +305,33 @@ class ConfigRenamer:
 
     def rename_config(self, config: str, index: int, protocol_type: str) -> Optional[str]:
         try:
-            config_lower = config.lower()
+            endpoint = parse_endpoint(config)
+            if not endpoint or endpoint.protocol not in OUTBOUND_PROTOCOLS:
+                logger.warning(f"Could not parse {protocol_type} config at index {index}")
+                return config
             
-            if config_lower.startswith('vmess://'):
-                data = parser.decode_vmess(config)
-                if not data or not all(k in data for k in ['add', 'port', 'id']):
-                    logger.warning(f"Could not parse VMess config at index {index}")
-                    return config
-                flag, country_code = self.get_location(data['add'])
-                protocol_info = self.build_protocol_info(protocol_type, data)
-                protocol_str = '/'.join(protocol_info)
-                new_name = f"{flag}{country_code}-{index}-{data['add']}-{data['port']}"
-                data['ps'] = new_name
+            flag, country_code = self.get_location(endpoint.address)
+            new_name = f"{flag}{country_code}-{index}-{endpoint.address}-{endpoint.port}"
+            data = endpoint.data
+            
+            if endpoint.protocol == 'vmess':
+                data = dict(data, ps=new_name)
                 encoded = base64.b64encode(json.dumps(data, ensure_ascii=False).encode('utf-8')).decode('utf-8')
                 return f"vmess://{encoded}"
             
-            elif config_lower.startswith('vless://'):
-                data = parser.parse_vless(config)
-                if not data:
-                    logger.warning(f"Could not parse VLESS config at index {index}")
-                    return config
-                flag, country_code = self.get_location(data['address'])
-                protocol_info = self.build_protocol_info(protocol_type, data)
-                protocol_str = '/'.join(protocol_info)
-                new_name = f"{flag}{country_code}-{index}-{data['address']}-{data['port']}"
-                url = urlparse(config)
-                params = parse_qs(url.query)
-                query_parts = []
-                for k, v in params.items():
-                    if isinstance(v, list) and v:
-                        query_parts.append(f"{k}={v[0]}")
-                query_string = '&'.join(query_parts)
-                new_config = f"vless://{data['uuid']}@{data['address']}:{data['port']}?{query_string}#{new_name}"
-                return new_config
-            
-            elif config_lower.startswith('trojan://'):
-                data = parser.parse_trojan(config)
-                if not data:
-                    logger.warning(f"Could not parse Trojan config at index {index}")
-                    return config
-                flag, country_code = self.get_location(data['address'])
-                protocol_info = self.build_protocol_info(protocol_type, data)
-                protocol_str = '/'.join(protocol_info)
-                new_name = f"{flag}{country_code}-{index}-{data['address']}-{data['port']}"
-                url = urlparse(config)
-                params = parse_qs(url.query)
-                query_parts = []
-                for k, v in params.items():
-                    if isinstance(v, list) and v:
-                        query_parts.append(f"{k}={v[0]}")
-                query_string = '&'.join(query_parts)
-                new_config = f"trojan://{data['password']}@{data['address']}:{data['port']}?{query_string}#{new_name}"
-                return new_config
+            elif endpoint.protocol in ('vless', 'trojan'):
+                query_string = '&'.join(f"{k}={v}" for k, v in endpoint.params.items())
+                credential = data['uuid'] if endpoint.protocol == 'vless' else data['password']
+                return f"{endpoint.protocol}://{credential}@{endpoint.address}:{endpoint.port}?{query_string}#{new_name}"
             
-            elif config_lower.startswith(('hysteria2://', 'hy2://')):
-                data = parser.parse_hysteria2(config)
-                if not data:
-                    logger.warning(f"Could not parse Hysteria2 config at index {index}")
-                    return config
-                flag, country_code = self.get_location(data['address'])
-                protocol_info = self.build_protocol_info(protocol_type, data)
-                protocol_str = '/'.join(protocol_info)
-                new_name = f"{flag}{country_code}-{index}-{data['address']}-{data['port']}"
-                url = urlparse(config)
-                query_string = url.query
-                protocol = 'hysteria2' if config_lower.startswith('hysteria2://') else 'hy2'
-                new_config = f"{protocol}://{data['password']}@{data['address']}:{data['port']}?{query_string}#{new_name}"
-                return new_config
+            elif endpoint.protocol == 'hysteria2':
+                protocol = config.split('://', 1)[0].lower()
+                return f"{protocol}://{data['password']}@{endpoint.address}:{endpoint.port}?{endpoint.query}#{new_name}"
             
-            elif config_lower.startswith('ss://'):
-                data = parser.parse_shadowsocks(config)
-                if not data:
-                    logger.warning(f"Could not parse Shadowsocks config at index {index}")
-                    return config
-                flag, country_code = self.get_location(data['address'])
-                protocol_info = self.build_protocol_info(protocol_type, data)
-                protocol_str = '/'.join(protocol_info)
-                new_name = f"{flag}{country_code}-{index}-{data['address']}-{data['port']}"
+            elif endpoint.protocol == 'ss':
                 method_pass = f"{data['method']}:{data['password']}"
                 encoded = base64.b64encode(method_pass.encode('utf-8')).decode('utf-8').replace('+', '-').replace('/', '_').rstrip('=')
-                new_config = f"ss://{encoded}@{data['address']}:{data['port']}#{new_name}"
-                return new_config
+                return f"ss://{encoded}@{endpoint.address}:{endpoint.port}#{new_name}"
             
             return config
         except Exception as e:
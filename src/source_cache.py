@@ -0,0 +1,97 @@
+import os
+import json
+import logging
+import threading
+from typing import Dict, List, Optional, Iterable
+
+logger = logging.getLogger(__name__)
+
+class SourceCache:
+    def __init__(self, cache_file: str):
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict] = {}
+        self.pending: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = {url: entry for url, entry in data.get('sources', {}).items() if isinstance(entry, dict)}
+            logger.info(f"Loaded {len(self.entries)} cached sources from {self.cache_file}")
+        except FileNotFoundError:
+            self.entries = {}
+        except Exception as e:
+            logger.warning(f"Error loading source cache, starting empty: {str(e)}")
+            self.entries = {}
+
+    def save(self, active_urls: Optional[Iterable[str]] = None):
+        try:
+            with self.lock:
+                entries = self.entries
+                if active_urls is not None:
+                    active = set(active_urls)
+                    entries = {url: entry for url, entry in entries.items() if url in active}
+                data = {'version': 1, 'sources': entries}
+
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            logger.info(f"Source cache saved to {self.cache_file}")
+        except Exception as e:
+            logger.error(f"Error saving source cache: {str(e)}")
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self.lock:
+            return self.entries.get(url)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        entry = self.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], body_hash: str, configs: List[str], total_configs: int):
+        with self.lock:
+            self.pending[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'body_hash': body_hash,
+                'total_configs': total_configs,
+                'configs': configs
+            }
+
+    def put_messages(self, url: str, last_message_id: int, messages: List[Dict]):
+        with self.lock:
+            self.pending[url] = {
+                'last_message_id': last_message_id,
+                'messages': messages
+            }
+
+    def refresh_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        with self.lock:
+            entry = self.pending.get(url) or self.entries.get(url)
+            if not entry:
+                return
+            entry = dict(entry)
+            if etag:
+                entry['etag'] = etag
+            if last_modified:
+                entry['last_modified'] = last_modified
+            self.pending[url] = entry
+
+    def commit(self, url: str):
+        with self.lock:
+            entry = self.pending.pop(url, None)
+            if entry is not None:
+                self.entries[url] = entry
+
+    def discard(self, url: str):
+        with self.lock:
+            self.pending.pop(url, None)
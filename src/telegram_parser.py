@@ -0,0 +1,105 @@
+import logging
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TelegramMessage = Tuple[Optional[int], Optional[datetime], str]
+
+class TelegramPageParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.messages: List[TelegramMessage] = []
+        self.div_depth = 0
+        self.message_depth = 0
+        self.text_depth = 0
+        self.message_id: Optional[int] = None
+        self.message_date: Optional[datetime] = None
+        self.message_texts: List[str] = []
+        self.text_parts: List[str] = []
+
+    @staticmethod
+    def parse_message_id(data_post: Optional[str]) -> Optional[int]:
+        if not data_post or '/' not in data_post:
+            return None
+        try:
+            return int(data_post.rsplit('/', 1)[1])
+        except ValueError:
+            return None
+
+    @staticmethod
+    def parse_datetime(value: str) -> Optional[datetime]:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'time':
+            if self.message_depth and self.message_date is None:
+                value = dict(attrs).get('datetime')
+                if value:
+                    self.message_date = self.parse_datetime(value)
+            return
+
+        if tag != 'div':
+            return
+
+        self.div_depth += 1
+        classes = (dict(attrs).get('class') or '').split()
+
+        if 'tgme_widget_message' in classes and not self.message_depth:
+            self.message_depth = self.div_depth
+            self.message_id = self.parse_message_id(dict(attrs).get('data-post'))
+            self.message_date = None
+            self.message_texts = []
+        elif 'tgme_widget_message_text' in classes and not self.text_depth:
+            self.text_depth = self.div_depth
+            self.text_parts = []
+
+    def handle_endtag(self, tag):
+        if tag != 'div' or not self.div_depth:
+            return
+
+        if self.text_depth == self.div_depth:
+            text = ''.join(self.text_parts)
+            if self.message_depth:
+                self.message_texts.append(text)
+            else:
+                self.messages.append((None, None, text))
+            self.text_depth = 0
+            self.text_parts = []
+        elif self.message_depth == self.div_depth:
+            self.flush_message()
+
+        self.div_depth -= 1
+
+    def handle_data(self, data):
+        if self.text_depth:
+            self.text_parts.append(data)
+
+    def flush_message(self):
+        for text in self.message_texts:
+            self.messages.append((self.message_id, self.message_date, text))
+        self.message_depth = 0
+        self.message_id = None
+        self.message_date = None
+        self.message_texts = []
+
+    def close(self):
+        super().close()
+        if self.text_depth:
+            self.message_texts.append(''.join(self.text_parts))
+            self.text_depth = 0
+        if self.message_depth or self.message_texts:
+            self.flush_message()
+
+def extract_telegram_messages(html: str) -> List[TelegramMessage]:
+    parser = TelegramPageParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception as e:
+        logger.warning(f"Error parsing Telegram page: {str(e)}")
+    return parser.messages
@@ -2,6 +2,11 @@
 
 # List of source URLs to fetch proxy configurations from.
 # Add or remove URLs as needed. All URLs in this list are automatically enabled.
+# A source can also be a list of URLs serving the same content: the first URL identifies the source
+# and the others are mirrors, e.g.
+# ["https://raw.githubusercontent.com/user/repo/main/sub.txt", "https://cdn.jsdelivr.net/gh/user/repo@main/sub.txt"]
+# Local files and directories can be added with file:// URLs, e.g. "file:///home/user/dumps/configs.txt"
+# or "file:///home/user/dumps/" (all files in the directory and its subdirectories are read).
 SOURCE_URLS = [
     #"https://raw.githubusercontent.com/4n0nymou3/multi-proxy-config-fetcher/refs/heads/main/configs/proxy_configs_tested.txt"
     "https://raw.githubusercontent.com/Epodonios/v2ray-configs/refs/heads/main/All_Configs_Sub.txt"
@@ -31,6 +36,83 @@ ENABLED_PROTOCOLS = {
 # Configurations older than this will be considered invalid.
 MAX_CONFIG_AGE_DAYS = 1
 
+# --- Fetcher Settings ---
+
+# Number of sources to fetch in parallel.
+# Set to 1 to fetch sources one after another.
+FETCH_MAX_WORKERS = 8
+
+# Maximum number of simultaneous requests sent to the same host.
+# Keeps the fetcher polite towards hosts that serve many sources (e.g. t.me, raw.githubusercontent.com).
+FETCH_PER_HOST_LIMIT = 2
+
+# Minimum delay (in seconds) between two requests to the same host.
+FETCH_PER_HOST_DELAY = 2
+
+# Set to True to keep a local cache of subscription sources (ETag, Last-Modified and content hash).
+# Unchanged sources are not downloaded or parsed again; their previously extracted configs are reused.
+ENABLE_SOURCE_CACHE = True
+
+# Maximum number of pages (about 20 messages each) to read per Telegram channel.
+# Older pages are read until MAX_CONFIG_AGE_DAYS or the last message seen in a previous run is reached.
+TELEGRAM_MAX_PAGES = 10
+
+# Maximum time (in seconds) spent on a single request, including all retries.
+FETCH_REQUEST_BUDGET_SECONDS = 180
+
+# Maximum time (in seconds) for the whole fetch stage.
+# Once exceeded, failed requests are no longer retried.
+FETCH_RUN_BUDGET_SECONDS = 1800
+
+# Time (in seconds) to wait for a source before also requesting its next mirror.
+# The first mirror to answer is used, and is tried first in the next run.
+FETCH_HEDGE_DELAY_SECONDS = 3
+
+# Set to True to fetch each source only when it is due, based on how often it publishes new configs.
+# Sources that are not due reuse their cached configs (requires ENABLE_SOURCE_CACHE).
+ENABLE_ADAPTIVE_SCHEDULING = True
+
+# Shortest and longest time (in hours) between two fetches of the same source.
+SCHEDULE_MIN_INTERVAL_HOURS = 0
+SCHEDULE_MAX_INTERVAL_HOURS = 72
+
+# Set to True to remember already seen configs as 8-byte digests instead of full strings.
+# Greatly reduces memory usage with very large numbers of configs (useful on small VPS and Termux devices).
+ENABLE_COMPACT_DEDUPE = False
+
+# Set to True to keep the compact dedupe digests in a temporary file instead of memory.
+# Only used when ENABLE_COMPACT_DEDUPE is True.
+DEDUPE_SPILL_TO_DISK = False
+
+# Set to True to automatically disable sources that mostly repost configs already found in other sources.
+# A source is disabled when the share of its configs not already supplied by higher-priority sources stays below
+# REDUNDANT_CHANNEL_MIN_UNIQUE_RATIO for REDUNDANT_CHANNEL_RUNS runs in a row. A source that is the only one
+# carrying some config is never disabled. Disabled sources are retried later.
+ENABLE_REDUNDANT_CHANNEL_PRUNING = False
+REDUNDANT_CHANNEL_MIN_UNIQUE_RATIO = 0.05
+REDUNDANT_CHANNEL_RUNS = 3
+
+# Set to True to fetch sources through proxies instead of connecting directly.
+# Useful on networks where t.me or raw.githubusercontent.com are throttled.
+# Working configs of the previous run (configs/proxy_configs_tested.txt) are started as local Xray proxies
+# (requires Xray) and requests are spread across them. Proxies that keep failing are replaced by the next config.
+# If no proxy can be started, sources are fetched directly.
+ENABLE_PROXY_FETCH = False
+
+# Number of proxies to run at the same time.
+PROXY_FETCH_POOL_SIZE = 3
+
+# Optional HTTP or SOCKS proxies to use before the tested configs, e.g. ["http://127.0.0.1:8080"]
+# SOCKS proxies require the 'requests[socks]' package.
+PROXY_FETCH_URLS = []
+
+# Set to True to keep parsed configs in a cache file (configs/parse_cache.bin) shared by all pipeline steps,
+# so that each step does not parse the same configs again.
+ENABLE_PARSE_CACHE = True
+
+# Maximum size of the parse cache file in megabytes. The least recently used configs are removed first.
+PARSE_CACHE_MAX_MB = 32
+
 # --- Sing-box Config Tester Settings ---
 
 # Set to True to enable testing of configs using sing-box.
@@ -5,9 +5,7 @@ import os
 import logging
 import re
 from typing import Dict, Optional, List
-from urllib.parse import urlparse, parse_qs, unquote
-import config_parser as parser
-import transport_builder
+from proxy_endpoint import parse_endpoint
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -157,88 +155,6 @@ class ConfigToXray:
             }
         }
 
-    def convert_vmess(self, data: Dict) -> Dict:
-        outbound = {
-            "protocol": "vmess",
-            "settings": {
-                "vnext": [
-                    {
-                        "address": data.get('add'),
-                        "port": int(data.get('port')),
-                        "users": [
-                            {
-                                "id": data.get('id'),
-                                "alterId": int(data.get('aid', 0)),
-                                "security": data.get('scy', 'auto'),
-                                "level": 8
-                            }
-                        ]
-                    }
-                ]
-            },
-            "streamSettings": transport_builder.build_xray_settings(data)
-        }
-        return outbound
-
-    def convert_vless(self, data: Dict) -> Dict:
-        outbound = {
-            "protocol": "vless",
-            "settings": {
-                "vnext": [
-                    {
-                        "address": data['address'],
-                        "port": data['port'],
-                        "users": [
-                            {
-                                "id": data['uuid'],
-                                "flow": data.get('flow', ''),
-                                "encryption": "none",
-                                "level": 8
-                            }
-                        ]
-                    }
-                ]
-            },
-            "streamSettings": transport_builder.build_xray_settings(data)
-        }
-        return outbound
-
-    def convert_trojan(self, data: Dict) -> Dict:
-        outbound = {
-            "protocol": "trojan",
-            "settings": {
-                "servers": [
-                    {
-                        "address": data['address'],
-                        "port": data['port'],
-                        "password": data['password'],
-                        "level": 8
-                    }
-                ]
-            },
-            "streamSettings": transport_builder.build_xray_settings(data)
-        }
-        return outbound
-
-    def convert_shadowsocks(self, data: Dict) -> Dict:
-        return {
-            "protocol": "shadowsocks",
-            "settings": {
-                "servers": [
-                    {
-                        "address": data['address'],
-                        "port": data['port'],
-                        "method": data['method'],
-                        "password": data['password'],
-                        "level": 8
-                    }
-                ]
-            },
-            "streamSettings": {
-                "network": "tcp"
-            }
-        }
-
     def process_configs(self):
         try:
             with open(self.input_file, 'r', encoding='utf-8') as f:
@@ -258,27 +174,12 @@ class ConfigToXray:
             if not line or line.startswith('//'):
                 continue
             
-            line_lower = line.lower()
             outbound = None
-            data = None
 
             try:
-                if line_lower.startswith('vmess://'):
-                    data = parser.decode_vmess(line)
-                    if data:
-                        outbound = self.convert_vmess(data)
-                elif line_lower.startswith('vless://'):
-                    data = parser.parse_vless(line)
-                    if data:
-                        outbound = self.convert_vless(data)
-                elif line_lower.startswith('trojan://'):
-                    data = parser.parse_trojan(line)
-                    if data:
-                        outbound = self.convert_trojan(data)
-                elif line_lower.startswith('ss://'):
-                    data = parser.parse_shadowsocks(line)
-                    if data:
-                        outbound = self.convert_shadowsocks(data)
+                endpoint = parse_endpoint(line)
+                if endpoint:
+                    outbound = endpoint.to_xray_outbound(level=8)
             except Exception as e:
                 logger.warning(f"Failed to parse config {line[:30]}...: {e}")
 
@@ -12,8 +12,8 @@ import socket
 import sys
 from contextlib import closing, contextmanager
 from config import ProxyConfig
-import config_parser as parser
-import transport_builder
+from config_provenance import ConfigProvenance, config_endpoint_key
+from proxy_endpoint import parse_endpoint
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -102,79 +102,8 @@ class XrayTester:
         
     def parse_config_string(self, config_str: str) -> Optional[Dict]:
         try:
-            config_lower = config_str.lower()
-            data = None
-            outbound = None
-            
-            if config_lower.startswith('vmess://'):
-                data = parser.decode_vmess(config_str)
-                if not data: return None
-                outbound = {
-                    "protocol": "vmess",
-                    "settings": {
-                        "vnext": [{
-                            "address": data.get('add'),
-                            "port": int(data.get('port')),
-                            "users": [{
-                                "id": data.get('id'),
-                                "alterId": int(data.get('aid', 0)),
-                                "security": data.get('scy', 'auto')
-                            }]
-                        }]
-                    },
-                    "streamSettings": transport_builder.build_xray_settings(data)
-                }
-            
-            elif config_lower.startswith('vless://'):
-                data = parser.parse_vless(config_str)
-                if not data: return None
-                outbound = {
-                    "protocol": "vless",
-                    "settings": {
-                        "vnext": [{
-                            "address": data['address'],
-                            "port": data['port'],
-                            "users": [{
-                                "id": data['uuid'],
-                                "encryption": "none",
-                                "flow": data.get('flow', '')
-                            }]
-                        }]
-                    },
-                    "streamSettings": transport_builder.build_xray_settings(data)
-                }
-                
-            elif config_lower.startswith('trojan://'):
-                data = parser.parse_trojan(config_str)
-                if not data: return None
-                outbound = {
-                    "protocol": "trojan",
-                    "settings": {
-                        "servers": [{
-                            "address": data['address'],
-                            "port": data['port'],
-                            "password": data['password']
-                        }]
-                    },
-                    "streamSettings": transport_builder.build_xray_settings(data)
-                }
-                
-            elif config_lower.startswith('ss://'):
-                data = parser.parse_shadowsocks(config_str)
-                if not data: return None
-                outbound = {
-                    "protocol": "shadowsocks",
-                    "settings": {
-                        "servers": [{
-                            "address": data['address'],
-                            "port": data['port'],
-                            "method": data['method'],
-                            "password": data['password']
-                        }]
-                    }
-                }
-            
-            return outbound
+            endpoint = parse_endpoint(config_str)
+            return endpoint.to_xray_outbound() if endpoint else None
             
         except Exception as e:
             logger.debug(f"Failed to parse config: {str(e)}")
@@ -386,6 +315,13 @@ def main():
     tester = ParallelXrayTester(max_workers=max_workers, timeout=timeout, test_urls=test_urls)
     working = tester.test_all(configs)
     
+    provenance = ConfigProvenance(config_settings.PROVENANCE_FILE)
+    provenance.record_test_results(
+        'xray',
+        (config_endpoint_key(config) for config in configs if tester.tester.is_supported_protocol(config)),
+        (config_endpoint_key(config) for config in working if tester.tester.is_supported_protocol(config))
+    )
+    
     os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
     with open(output_file, 'w', encoding='utf-8') as f:
         for header in header_lines:
@@ -0,0 +1,105 @@
+import os
+import sys
+import threading
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import config_parser
+from config import ProxyConfig
+from egress_pool import EgressPool
+from fetch_configs import ConfigFetcher, HostRateLimiter
+from xray_config_tester import find_free_port
+
+BODIES = [b'vless://uuid@example.com:443#first\n', b'trojan://password@example.org:443#second\n' * 100]
+
+class SourceHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_body(BODIES[int(self.path.rsplit('/', 1)[-1])])
+
+    def send_body(self, body: bytes):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class StandInProxyHandler(SourceHandler):
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+    requests = 0
+
+    def do_GET(self):
+        StandInProxyHandler.requests += 1
+        with self.opener.open(self.path, timeout=10) as upstream:
+            self.send_body(upstream.read())
+
+class EgressPoolTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        config_parser.disable_parse_cache()
+        cls.servers = [ThreadingHTTPServer(('127.0.0.1', 0), handler) for handler in (SourceHandler, StandInProxyHandler)]
+        for server in cls.servers:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        source_port, cls.proxy_port = (server.server_address[1] for server in cls.servers)
+        cls.urls = [f"http://127.0.0.1:{source_port}/{i}" for i in range(len(BODIES))]
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers:
+            server.shutdown()
+            server.server_close()
+
+    def setUp(self):
+        self.config = ProxyConfig()
+        self.config.ENABLE_PROXY_FETCH = False
+        self.config.ENABLE_SOURCE_CACHE = False
+        self.fetcher = ConfigFetcher(self.config)
+        self.fetcher.host_limiter = HostRateLimiter(self.config.FETCH_MAX_WORKERS, 0)
+        self.fetcher.backoff_delay = lambda attempt: 0
+        StandInProxyHandler.requests = 0
+
+    def tearDown(self):
+        if self.fetcher.egress_pool:
+            self.fetcher.egress_pool.close()
+        self.fetcher.ssconf_executor.shutdown(wait=False)
+        self.fetcher.hedge_executor.shutdown(wait=False)
+
+    def fetch_all(self):
+        for url, body in zip(self.urls, BODIES):
+            response = self.fetcher.fetch_with_retry(url)
+            self.assertIsNotNone(response, url)
+            self.assertEqual(response.content, body)
+
+    def test_fetches_through_stand_in_proxies(self):
+        proxy_url = f"http://127.0.0.1:{self.proxy_port}"
+        self.fetcher.egress_pool = EgressPool([proxy_url, proxy_url], size=2)
+
+        self.fetch_all()
+
+        self.assertEqual(StandInProxyHandler.requests, len(BODIES))
+        self.assertEqual([egress.requests for egress in self.fetcher.egress_pool.egresses], [1, 1])
+
+    def test_rotates_out_unreachable_proxy(self):
+        proxy_url = f"http://127.0.0.1:{self.proxy_port}"
+        self.fetcher.egress_pool = EgressPool(
+            [f"http://127.0.0.1:{find_free_port()}", proxy_url, proxy_url],
+            size=2, failure_threshold=self.config.PROXY_FETCH_FAILURE_THRESHOLD
+        )
+
+        self.fetch_all()
+
+        pool = self.fetcher.egress_pool
+        self.assertEqual(pool.rotated_out, 1)
+        self.assertTrue(all(egress.proxy_url == proxy_url for egress in pool.egresses))
+
+    def test_fetches_directly_without_pool(self):
+        self.fetch_all()
+
+        self.assertEqual(StandInProxyHandler.requests, 0)
+
+if __name__ == '__main__':
+    unittest.main()